@@ -1,6 +1,76 @@
 """
 Attribute Mapper Module for mapping different attribute names
 """
+import logging
+import sqlite3
+
+try:
+    import numpy as np
+    from rapidfuzz import process, fuzz
+    HAVE_RAPIDFUZZ = True
+except ImportError:
+    # Fall back to the pure-Python bit-parallel scorer below
+    HAVE_RAPIDFUZZ = False
+
+logger = logging.getLogger(__name__)
+
+def _levenshtein(pattern, text):
+    """
+    Bit-parallel Levenshtein distance (Myers' algorithm).
+
+    Each text character updates the whole dynamic-programming column
+    with a handful of 64-bit-style bitwise operations, so the distance
+    costs O(len(text)) word operations for patterns up to 64 characters
+    (always the case for property names).
+
+    Args:
+        pattern (str): First string (at most 64 characters are used)
+        text (str): Second string
+
+    Returns:
+        int: Edit distance between the two strings
+    """
+    m = len(pattern)
+    if m == 0:
+        return len(text)
+    if m > 64:
+        pattern = pattern[:64]
+        m = 64
+
+    # Bitmask per pattern character
+    eq_masks = {}
+    for i, ch in enumerate(pattern):
+        eq_masks[ch] = eq_masks.get(ch, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    high_bit = 1 << (m - 1)
+    vp = mask
+    vn = 0
+    distance = m
+
+    for ch in text:
+        eq = eq_masks.get(ch, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        ph = vn | (~(xh | vp) & mask)
+        mh = vp & xh
+        if ph & high_bit:
+            distance += 1
+        elif mh & high_bit:
+            distance -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        vp = mh | (~(xv | ph) & mask)
+        vn = ph & xv
+
+    return distance
+
+def _similarity(str1, str2):
+    """Edit-distance based similarity between 0 and 1"""
+    longest = max(len(str1), len(str2))
+    if longest == 0:
+        return 1.0
+    return 1.0 - _levenshtein(str1.lower(), str2.lower()) / longest
 
 class AttributeMapper:
     """Class for mapping different attribute names to standardized names"""
@@ -13,7 +83,7 @@ class AttributeMapper:
             db_manager: Instance of DatabaseManager
         """
         self.db_manager = db_manager
-        self.mappings = {}  # Format: {(original_name, language): standard_name}
+        self.mappings = {}  # Format: {language: {original_name: standard_name}}
         self.load_mappings()
         
     def load_mappings(self):
@@ -26,10 +96,8 @@ class AttributeMapper:
         rows = cursor.fetchall()
         
         for original_name, standard_name, language in rows:
-            self.mappings[(original_name, language)] = standard_name
-            
-        self.db_manager.close()
-        
+            self.mappings.setdefault(language, {})[original_name] = standard_name
+
     def add_mapping(self, original_name, standard_name, language):
         """
         Create a new mapping between original and standard names.
@@ -51,14 +119,12 @@ class AttributeMapper:
                 (original_name, standard_name, language, 1.0)  # Manual mappings have confidence 1.0
             )
             conn.commit()
-            self.mappings[(original_name, language)] = standard_name
+            self.mappings.setdefault(language, {})[original_name] = standard_name
             return True
-        except Exception as e:
-            print(f"Error saving mapping: {str(e)}")
+        except sqlite3.Error:
+            logger.exception("Error saving mapping for %s", original_name)
             return False
-        finally:
-            self.db_manager.close()
-            
+
     def get_standard_name(self, original_name, language):
         """
         Get the standardized name for an original attribute name.
@@ -70,7 +136,8 @@ class AttributeMapper:
         Returns:
             str: Standardized name or original_name if no mapping exists
         """
-        return self.mappings.get((original_name, language), original_name)
+        # Two plain string lookups instead of hashing a fresh tuple per call
+        return self.mappings.get(language, {}).get(original_name, original_name)
     
     def suggest_mappings(self, property_names):
         """
@@ -89,47 +156,69 @@ class AttributeMapper:
         cursor = conn.cursor()
         cursor.execute('SELECT name_de, name_en FROM PropertyDefinitions')
         standard_names = cursor.fetchall()
-        self.db_manager.close()
-        
+
         # Flatten standard_names list
         all_standard_names = [name for pair in standard_names for name in pair if name]
         
-        for prop_name in property_names:
-            if not any(prop_name == orig for (orig, _) in self.mappings.keys()):
-                # Calculate similarity to known standard names
+        # Only score properties without an existing mapping
+        known_origs = set()
+        for lang_mappings in self.mappings.values():
+            known_origs.update(lang_mappings)
+        unknown_names = [
+            prop_name for prop_name in property_names
+            if prop_name not in known_origs
+        ]
+
+        if not unknown_names or not all_standard_names:
+            return {name: [] for name in unknown_names}
+
+        if not HAVE_RAPIDFUZZ:
+            # Pure-Python fallback using the bit-parallel scorer
+            for prop_name in unknown_names:
                 prop_suggestions = []
-                
+                prop_len = len(prop_name)
+
                 for std_name in all_standard_names:
-                    # Simple similarity calculation (can be replaced with more complex algorithms)
-                    similarity = self._calculate_similarity(prop_name, std_name)
+                    # The edit distance is at least the length difference, so
+                    # pairs whose lengths differ by more than 40% of the longer
+                    # name can never clear the similarity threshold
+                    longest = max(prop_len, len(std_name))
+                    if abs(prop_len - len(std_name)) > 0.4 * longest:
+                        continue
+
+                    similarity = _similarity(prop_name, std_name)
                     if similarity > 0.6:  # Threshold for suggestions
                         prop_suggestions.append((std_name, similarity))
-                
+
                 # Sort by similarity
                 prop_suggestions.sort(key=lambda x: x[1], reverse=True)
                 suggestions[prop_name] = prop_suggestions[:3]  # Up to 3 suggestions
-                
+
+            return suggestions
+
+        # Compute the full score matrix in one multi-threaded C call
+        scores = process.cdist(
+            unknown_names, all_standard_names,
+            scorer=fuzz.WRatio, workers=-1, dtype=np.uint8
+        )
+
+        for i, prop_name in enumerate(unknown_names):
+            row = scores[i]
+
+            # Select the top 3 candidates without sorting the whole row.
+            # Partition ascending and take the tail: negating the uint8
+            # row would wrap modulo 256 and rank zero scores first
+            if len(row) > 3:
+                top_idx = np.argpartition(row, len(row) - 3)[-3:]
+            else:
+                top_idx = np.arange(len(row))
+
+            # Keep candidates above the cutoff, best first, scores in 0-1 range
+            prop_suggestions = [
+                (all_standard_names[j], row[j] / 100.0)
+                for j in top_idx if row[j] >= 60
+            ]
+            prop_suggestions.sort(key=lambda x: x[1], reverse=True)
+            suggestions[prop_name] = prop_suggestions
+
         return suggestions
-    
-    def _calculate_similarity(self, str1, str2):
-        """
-        Calculate similarity between two strings (simple implementation).
-        
-        Args:
-            str1 (str): First string
-            str2 (str): Second string
-            
-        Returns:
-            float: Similarity value between 0 and 1
-        """
-        # This implementation is simplified and can be replaced with better algorithms
-        str1_lower = str1.lower()
-        str2_lower = str2.lower()
-        
-        # Simple containment check
-        if str1_lower in str2_lower or str2_lower in str1_lower:
-            return 0.8
-            
-        # Count common characters
-        common_chars = set(str1_lower) & set(str2_lower)
-        return len(common_chars) / max(len(set(str1_lower)), len(set(str2_lower)))
@@ -1,8 +1,12 @@
 """
 Database Manager Module for handling database operations
 """
+import csv
+import html
 import sqlite3
-import pandas as pd
+import threading
+from contextlib import contextmanager
+from itertools import groupby
 
 class DatabaseManager:
     """Class to handle database operations"""
@@ -12,17 +16,65 @@ class DatabaseManager:
         self.db_path = db_path
         self.conn = None
         self.cursor = None
+        # Serializes writers; readers run unguarded under WAL. Re-entrant
+        # so store_* calls can run inside an open transaction() block
+        self._write_lock = threading.RLock()
+        self._in_transaction = False
         
     def connect(self):
-        """Establish database connection"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
+        """Return the shared database connection, opening it on first use"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(
+                self.db_path, check_same_thread=False,
+                # Large statement cache so hot queries skip re-compilation
+                cached_statements=512
+            )
+            self.cursor = self.conn.cursor()
+
+            # Tune SQLite for bulk workloads; WAL keeps readers unblocked
+            self.cursor.execute('PRAGMA journal_mode=WAL')
+            self.cursor.execute('PRAGMA synchronous=NORMAL')
+            self.cursor.execute('PRAGMA temp_store=MEMORY')
+            self.cursor.execute('PRAGMA cache_size=-64000')
         return self.conn
-        
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group many store_* calls into a single transaction.
+
+        Inside the block the per-call commits in store_product and
+        friends are suppressed, so the whole batch costs one fsync; the
+        caller may still commit mid-way for progress durability.
+        """
+        conn = self.connect()
+        with self._write_lock:
+            self._in_transaction = True
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._in_transaction = False
+
     def close(self):
-        """Close database connection"""
+        """Close the database connection (called on shutdown)"""
         if self.conn:
             self.conn.close()
+            self.conn = None
+            self.cursor = None
+
+    def __enter__(self):
+        """Open the connection so the manager works as a context manager"""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Close the connection when leaving the with-block"""
+        self.close()
+        return False
             
     def initialize_database(self):
         """Create database schema if not exists"""
@@ -98,201 +150,399 @@ class DatabaseManager:
         )
         ''')
         
+        # Fingerprints of already-imported description HTML, used to skip
+        # re-parsing unchanged rows on repeat imports
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS HtmlFingerprints (
+            article_id TEXT,
+            language TEXT,
+            fingerprint INTEGER,
+            PRIMARY KEY (article_id, language)
+        )
+        ''')
+
+        # Unique keys used by the upsert and INSERT OR REPLACE writes
+        self.cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_properties_key
+        ON Properties(article_id, property_name, language)
+        ''')
+        self.cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_property_overrides_key
+        ON PropertyOverrides(article_id, property_name, language)
+        ''')
+        self.cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_category_overrides_key
+        ON CategoryPropertyOverrides(category, property_name, language)
+        ''')
+
+        # Lookup indexes for the remaining hot WHERE columns
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON Products(category)')
+
+        # Definition names are unique per language so writes can upsert on
+        # them directly (SQLite permits any number of NULLs in both)
+        self.cursor.execute('DROP INDEX IF EXISTS idx_propdef_de')
+        self.cursor.execute('DROP INDEX IF EXISTS idx_propdef_en')
+        self.cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_propdef_de ON PropertyDefinitions(name_de)')
+        self.cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_propdef_en ON PropertyDefinitions(name_en)')
+
+        # Properties with both override layers already merged, so readers
+        # get final values from one indexed join inside SQLite instead of
+        # a Python-side merge. Article overrides win over category
+        # overrides, which only replace existing properties; the UNION ALL
+        # branch adds article overrides for properties the import never
+        # produced. Dropped and recreated so definition changes take
+        # effect on existing databases.
+        self.cursor.execute('DROP VIEW IF EXISTS MergedProperties')
+        self.cursor.execute('''
+        CREATE VIEW MergedProperties AS
+        SELECT pr.article_id,
+               pr.property_name,
+               COALESCE(ao.override_value, co.override_value,
+                        CASE WHEN pr.property_unit IS NULL OR pr.property_unit = ''
+                             THEN pr.property_value
+                             ELSE pr.property_value || ' ' || pr.property_unit END) AS property_value,
+               pr.language
+        FROM Properties pr
+        JOIN Products p ON p.article_id = pr.article_id
+        LEFT JOIN PropertyOverrides ao
+               ON ao.article_id = pr.article_id
+              AND ao.property_name = pr.property_name
+              AND ao.language = pr.language
+        LEFT JOIN CategoryPropertyOverrides co
+               ON co.category = p.category
+              AND co.property_name = pr.property_name
+              AND co.language = pr.language
+        UNION ALL
+        SELECT ao.article_id, ao.property_name, ao.override_value, ao.language
+        FROM PropertyOverrides ao
+        WHERE NOT EXISTS (
+            SELECT 1 FROM Properties pr
+            WHERE pr.article_id = ao.article_id
+              AND pr.property_name = ao.property_name
+              AND pr.language = ao.language
+        )
+        ''')
+
         self.conn.commit()
-        self.close()
-        
+
     def store_product(self, article_id, name=None, price=None, stock=None, category=None):
         """Store or update product information"""
         self.connect()
-        
-        # Check if product exists
-        self.cursor.execute('SELECT article_id FROM Products WHERE article_id = ?', (article_id,))
-        exists = self.cursor.fetchone()
-        
-        if exists:
-            # Update existing product
-            query = 'UPDATE Products SET '
-            params = []
-            
-            if name is not None:
-                query += 'name = ?, '
-                params.append(name)
-            
-            if price is not None:
-                query += 'price = ?, '
-                params.append(price)
-                
-            if stock is not None:
-                query += 'stock = ?, '
-                params.append(stock)
-                
-            if category is not None:
-                query += 'category = ?, '
-                params.append(category)
-                
-            # Remove last comma and space
-            query = query.rstrip(', ')
-            
-            query += ' WHERE article_id = ?'
-            params.append(article_id)
-            
-            self.cursor.execute(query, params)
-        else:
-            # Insert new product
-            self.cursor.execute(
-                'INSERT INTO Products (article_id, name, price, stock, category) VALUES (?, ?, ?, ?, ?)',
-                (article_id, name, price, stock, category)
-            )
-            
-        self.conn.commit()
-        self.close()
-        
+
+        with self._write_lock:
+            # Single upsert; COALESCE keeps the existing value where None is passed
+            self.cursor.execute('''
+            INSERT INTO Products (article_id, name, price, stock, category)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(article_id) DO UPDATE SET
+                name = COALESCE(excluded.name, name),
+                price = COALESCE(excluded.price, price),
+                stock = COALESCE(excluded.stock, stock),
+                category = COALESCE(excluded.category, category)
+            ''', (article_id, name, price, stock, category))
+
+            if not self._in_transaction:
+                self.conn.commit()
+
     def store_property(self, article_id, property_name, property_value, property_unit=None, language='de'):
         """Store product property"""
         self.connect()
-        
-        # Check if property exists
-        self.cursor.execute(
-            'SELECT id FROM Properties WHERE article_id = ? AND property_name = ? AND language = ?', 
-            (article_id, property_name, language)
-        )
-        property_id = self.cursor.fetchone()
-        
-        if property_id:
-            # Update existing property
-            self.cursor.execute(
-                'UPDATE Properties SET property_value = ?, property_unit = ? WHERE id = ?',
-                (property_value, property_unit, property_id[0])
+
+        with self._write_lock:
+            # Single upsert keyed on (article_id, property_name, language)
+            self.cursor.execute('''
+            INSERT INTO Properties (article_id, property_name, property_value, property_unit, language)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(article_id, property_name, language) DO UPDATE SET
+                property_value = excluded.property_value,
+                property_unit = excluded.property_unit
+            ''', (article_id, property_name, property_value, property_unit, language))
+
+            if not self._in_transaction:
+                self.conn.commit()
+
+    def store_products_bulk(self, rows):
+        """
+        Store many products in a single transaction.
+
+        Args:
+            rows: Iterable of (article_id, name, price, stock, category) tuples
+        """
+        conn = self.connect()
+
+        # One transaction and one prepared statement for the whole batch.
+        # Same COALESCE upsert as store_product: OR REPLACE would wipe
+        # previously stored fields wherever a row passes None
+        with self._write_lock, conn:
+            conn.executemany('''
+            INSERT INTO Products (article_id, name, price, stock, category)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(article_id) DO UPDATE SET
+                name = COALESCE(excluded.name, name),
+                price = COALESCE(excluded.price, price),
+                stock = COALESCE(excluded.stock, stock),
+                category = COALESCE(excluded.category, category)
+            ''', rows)
+
+    def store_properties_bulk(self, rows):
+        """
+        Store many properties in a single transaction.
+
+        Args:
+            rows: Iterable of (article_id, property_name, property_value, property_unit, language) tuples
+        """
+        conn = self.connect()
+
+        # One transaction and one prepared statement for the whole batch
+        with self._write_lock, conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO Properties (article_id, property_name, property_value, property_unit, language) VALUES (?, ?, ?, ?, ?)',
+                rows
             )
-        else:
-            # Insert new property
-            self.cursor.execute(
-                'INSERT INTO Properties (article_id, property_name, property_value, property_unit, language) VALUES (?, ?, ?, ?, ?)',
-                (article_id, property_name, property_value, property_unit, language)
+
+    def load_html_fingerprints(self):
+        """Load all stored HTML fingerprints as {(article_id, language): fingerprint}"""
+        conn = self.connect()
+        cursor = conn.execute('SELECT article_id, language, fingerprint FROM HtmlFingerprints')
+        return {(article_id, language): fingerprint
+                for article_id, language, fingerprint in cursor}
+
+    def store_html_fingerprints_bulk(self, rows):
+        """
+        Store many HTML fingerprints in a single transaction.
+
+        Args:
+            rows: Iterable of (article_id, language, fingerprint) tuples
+        """
+        conn = self.connect()
+
+        with self._write_lock, conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO HtmlFingerprints (article_id, language, fingerprint) VALUES (?, ?, ?)',
+                rows
             )
-            
-        self.conn.commit()
-        self.close()
-    
+
     def add_new_property_if_not_exists(self, property_name, language):
         """Add a new property to the definitions if it doesn't exist"""
         self.connect()
-        
-        # Check if property definition exists
-        if language == 'de':
-            self.cursor.execute('SELECT property_id FROM PropertyDefinitions WHERE name_de = ?', (property_name,))
-        else:
-            self.cursor.execute('SELECT property_id FROM PropertyDefinitions WHERE name_en = ?', (property_name,))
-            
-        exists = self.cursor.fetchone()
-        
-        if not exists:
-            # Insert new property definition
+
+        # The check-then-insert must run atomically across worker threads
+        with self._write_lock:
+            # Check if property definition exists
             if language == 'de':
-                self.cursor.execute(
-                    'INSERT INTO PropertyDefinitions (name_de, name_en, data_type, expected_unit) VALUES (?, NULL, "string", NULL)',
-                    (property_name,)
-                )
+                self.cursor.execute('SELECT property_id FROM PropertyDefinitions WHERE name_de = ?', (property_name,))
             else:
-                self.cursor.execute(
-                    'INSERT INTO PropertyDefinitions (name_de, name_en, data_type, expected_unit) VALUES (NULL, ?, "string", NULL)',
-                    (property_name,)
-                )
-            
-            self.conn.commit()
-            result = True
-        else:
-            result = False
-            
-        self.close()
+                self.cursor.execute('SELECT property_id FROM PropertyDefinitions WHERE name_en = ?', (property_name,))
+
+            exists = self.cursor.fetchone()
+
+            if not exists:
+                # Insert new property definition
+                if language == 'de':
+                    self.cursor.execute(
+                        'INSERT INTO PropertyDefinitions (name_de, name_en, data_type, expected_unit) VALUES (?, NULL, "string", NULL)',
+                        (property_name,)
+                    )
+                else:
+                    self.cursor.execute(
+                        'INSERT INTO PropertyDefinitions (name_de, name_en, data_type, expected_unit) VALUES (NULL, ?, "string", NULL)',
+                        (property_name,)
+                    )
+
+                if not self._in_transaction:
+                    self.conn.commit()
+                result = True
+            else:
+                result = False
+
         return result
-        
+
+    def add_new_properties_bulk(self, properties):
+        """
+        Add many property definitions at once, skipping existing names.
+
+        The unique indexes on name_de/name_en turn the per-name existence
+        check into INSERT OR IGNORE, so the whole batch is two prepared
+        statements in one transaction.
+
+        Args:
+            properties (iterable): (property_name, language) pairs
+
+        Returns:
+            int: Number of definitions actually inserted
+        """
+        conn = self.connect()
+
+        de_rows = []
+        en_rows = []
+        for property_name, language in properties:
+            if language == 'de':
+                de_rows.append((property_name,))
+            else:
+                en_rows.append((property_name,))
+
+        with self._write_lock, conn:
+            before = conn.total_changes
+            if de_rows:
+                conn.executemany(
+                    'INSERT OR IGNORE INTO PropertyDefinitions (name_de, name_en, data_type, expected_unit) VALUES (?, NULL, "string", NULL)',
+                    de_rows
+                )
+            if en_rows:
+                conn.executemany(
+                    'INSERT OR IGNORE INTO PropertyDefinitions (name_de, name_en, data_type, expected_unit) VALUES (NULL, ?, "string", NULL)',
+                    en_rows
+                )
+            inserted = conn.total_changes - before
+
+        return inserted
+
+    def iter_products(self):
+        """Yield all products from the database in chunks of 1000 rows"""
+        conn = self.connect()
+
+        # Dedicated cursor so interleaved queries don't clobber the scan
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM Products')
+
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            yield from rows
+
     def get_all_products(self):
         """Get all products from database"""
-        self.connect()
-        self.cursor.execute('SELECT * FROM Products')
-        products = self.cursor.fetchall()
-        self.close()
-        return products
+        return list(self.iter_products())
     
     def get_products_by_category(self, category):
         """Get products filtered by category"""
         self.connect()
         self.cursor.execute('SELECT * FROM Products WHERE category = ?', (category,))
         products = self.cursor.fetchall()
-        self.close()
         return products
+
+    def count_products(self, category=None):
+        """Count products, optionally filtered by category"""
+        conn = self.connect()
+        if category:
+            cursor = conn.execute('SELECT COUNT(*) FROM Products WHERE category = ?', (category,))
+        else:
+            cursor = conn.execute('SELECT COUNT(*) FROM Products')
+        return cursor.fetchone()[0]
+
+    def get_products_page(self, category, limit, offset):
+        """
+        Get one page of products ordered by article ID.
+
+        The stable ORDER BY makes LIMIT/OFFSET pages non-overlapping, and
+        article_id is the primary key so the ordering is index-backed.
+        """
+        conn = self.connect()
+        if category:
+            cursor = conn.execute(
+                'SELECT * FROM Products WHERE category = ? ORDER BY article_id LIMIT ? OFFSET ?',
+                (category, limit, offset)
+            )
+        else:
+            cursor = conn.execute(
+                'SELECT * FROM Products ORDER BY article_id LIMIT ? OFFSET ?',
+                (limit, offset)
+            )
+        return cursor.fetchall()
+
+    def get_distinct_categories(self):
+        """Get the sorted distinct product categories"""
+        conn = self.connect()
+        # Answered straight from idx_products_category without touching
+        # the table rows
+        cursor = conn.execute(
+            'SELECT DISTINCT category FROM Products WHERE category IS NOT NULL ORDER BY category'
+        )
+        return [row[0] for row in cursor.fetchall()]
     
     def get_product_properties(self, article_id):
-        """Get properties for a specific product"""
-        self.connect()
-        self.cursor.execute('SELECT property_name, property_value, property_unit, language FROM Properties WHERE article_id = ?', (article_id,))
-        properties = self.cursor.fetchall()
-        self.close()
-        return properties
+        """Yield properties for a specific product without materializing a list"""
+        conn = self.connect()
+
+        # Dedicated cursor so interleaved queries don't clobber the scan
+        cursor = conn.cursor()
+        cursor.execute('SELECT property_name, property_value, property_unit, language FROM Properties WHERE article_id = ?', (article_id,))
+        yield from cursor
     
     def get_property_definitions(self):
         """Get all property definitions"""
         self.connect()
         self.cursor.execute('SELECT name_de, name_en, data_type, expected_unit FROM PropertyDefinitions')
         definitions = self.cursor.fetchall()
-        self.close()
         return definitions
     
     def store_property_override(self, article_id, property_name, override_value, language):
         """Store a property override for a specific article"""
         self.connect()
-        
-        # Check if override exists
-        self.cursor.execute(
-            'SELECT override_id FROM PropertyOverrides WHERE article_id = ? AND property_name = ? AND language = ?',
-            (article_id, property_name, language)
-        )
-        override_id = self.cursor.fetchone()
-        
-        if override_id:
-            # Update existing override
-            self.cursor.execute(
-                'UPDATE PropertyOverrides SET override_value = ? WHERE override_id = ?',
-                (override_value, override_id[0])
-            )
-        else:
-            # Insert new override
-            self.cursor.execute(
-                'INSERT INTO PropertyOverrides (article_id, property_name, override_value, language) VALUES (?, ?, ?, ?)',
-                (article_id, property_name, override_value, language)
-            )
-            
-        self.conn.commit()
-        self.close()
-        
+
+        with self._write_lock:
+            # Single upsert keyed on (article_id, property_name, language)
+            self.cursor.execute('''
+            INSERT INTO PropertyOverrides (article_id, property_name, override_value, language)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(article_id, property_name, language) DO UPDATE SET
+                override_value = excluded.override_value
+            ''', (article_id, property_name, override_value, language))
+
+            if not self._in_transaction:
+                self.conn.commit()
+
     def store_category_property_override(self, category, property_name, override_value, language):
         """Store a property override for a category"""
         self.connect()
-        
-        # Check if override exists
-        self.cursor.execute(
-            'SELECT override_id FROM CategoryPropertyOverrides WHERE category = ? AND property_name = ? AND language = ?',
-            (category, property_name, language)
-        )
-        override_id = self.cursor.fetchone()
-        
-        if override_id:
-            # Update existing override
-            self.cursor.execute(
-                'UPDATE CategoryPropertyOverrides SET override_value = ? WHERE override_id = ?',
-                (override_value, override_id[0])
-            )
-        else:
-            # Insert new override
-            self.cursor.execute(
-                'INSERT INTO CategoryPropertyOverrides (category, property_name, override_value, language) VALUES (?, ?, ?, ?)',
-                (category, property_name, override_value, language)
-            )
-            
-        self.conn.commit()
-        self.close()
-        
+
+        with self._write_lock:
+            # Single upsert keyed on (category, property_name, language)
+            self.cursor.execute('''
+            INSERT INTO CategoryPropertyOverrides (category, property_name, override_value, language)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(category, property_name, language) DO UPDATE SET
+                override_value = excluded.override_value
+            ''', (category, property_name, override_value, language))
+
+            if not self._in_transaction:
+                self.conn.commit()
+
+    def store_property_overrides_bulk(self, rows):
+        """
+        Store many article property overrides in a single transaction.
+
+        Args:
+            rows: Iterable of (article_id, property_name, override_value, language) tuples
+        """
+        conn = self.connect()
+
+        with self._write_lock, conn:
+            conn.executemany('''
+            INSERT INTO PropertyOverrides (article_id, property_name, override_value, language)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(article_id, property_name, language) DO UPDATE SET
+                override_value = excluded.override_value
+            ''', rows)
+
+    def store_category_property_overrides_bulk(self, rows):
+        """
+        Store many category property overrides in a single transaction.
+
+        Args:
+            rows: Iterable of (category, property_name, override_value, language) tuples
+        """
+        conn = self.connect()
+
+        with self._write_lock, conn:
+            conn.executemany('''
+            INSERT INTO CategoryPropertyOverrides (category, property_name, override_value, language)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(category, property_name, language) DO UPDATE SET
+                override_value = excluded.override_value
+            ''', rows)
+
     def get_property_overrides(self, article_id):
         """Get all property overrides for a specific article"""
         self.connect()
@@ -315,114 +565,125 @@ class DatabaseManager:
                 (category,)
             )
             category_overrides = self.cursor.fetchall()
-            
-        self.close()
+
         return article_overrides, category_overrides
-    
-def export_products_csv(self, output_file, include_html=True):
-    """Export products to CSV format for shop import"""
-    self.connect()
-    
-    # Get all products
-    self.cursor.execute('SELECT article_id, name, price, stock, category FROM Products')
-    products = self.cursor.fetchall()
-    
-    # Create DataFrame for export
-    export_data = []
-    
-    for product in products:
-        article_id, name, price, stock, category = product
-        
-        # Get properties for this product
-        self.cursor.execute(
-            'SELECT property_name, property_value, property_unit, language FROM Properties WHERE article_id = ?', 
-            (article_id,)
-        )
-        properties = self.cursor.fetchall()
-        
-        # Get overrides
-        article_overrides, category_overrides = self.get_property_overrides(article_id)
-        
-        # Organize properties by language
-        de_properties = {}
-        en_properties = {}
-        
-        # First add regular properties
-        for prop in properties:
-            prop_name, prop_value, prop_unit, lang = prop
-            if lang == 'de':
-                if prop_unit:
-                    de_properties[prop_name] = f"{prop_value} {prop_unit}"
-                else:
-                    de_properties[prop_name] = prop_value
-            elif lang == 'en':
-                if prop_unit:
-                    en_properties[prop_name] = f"{prop_value} {prop_unit}"
-                else:
-                    en_properties[prop_name] = prop_value
-        
-        # Apply category overrides
-        for prop_name, override_value, lang in category_overrides:
-            if lang == 'de' and prop_name in de_properties:
-                de_properties[prop_name] = override_value
-            elif lang == 'en' and prop_name in en_properties:
-                en_properties[prop_name] = override_value
-        
-        # Apply article-specific overrides (higher priority)
-        for prop_name, override_value, lang in article_overrides:
-            if lang == 'de':
-                de_properties[prop_name] = override_value
-            elif lang == 'en':
-                en_properties[prop_name] = override_value
-        
-        # Build HTML content if requested
-        p_desc_de = ""
-        p_desc_en = ""
-        
-        if include_html:
-            # Generate HTML table for German description
-            p_desc_de = "<table>"
-            for prop_name, prop_value in de_properties.items():
-                p_desc_de += f"<tr><td>{prop_name}</td><td>{prop_value}</td></tr>"
-            p_desc_de += "</table>"
-            
-            # Generate HTML table for English description
-            p_desc_en = "<table>"
-            for prop_name, prop_value in en_properties.items():
-                p_desc_en += f"<tr><td>{prop_name}</td><td>{prop_value}</td></tr>"
-            p_desc_en += "</table>"
-        
-        # Create row for this product - adding XTSOL as a constant column
-        product_row = {
-            'XTSOL': 'XTSOL',  # Adding the XTSOL column with constant value
-            'article_id': article_id,
-            'name': name,
-            'price': price,
-            'stock': stock,
-            'category': category,
-            'p_desc.de': p_desc_de,
-            'p_desc.en': p_desc_en
-        }
-        
-        # Add individual properties
-        for prop_name, prop_value in de_properties.items():
-            product_row[f"prop_{prop_name}"] = prop_value
-            
-        for prop_name, prop_value in en_properties.items():
-            product_row[f"prop_{prop_name}.en"] = prop_value
-            
-        export_data.append(product_row)
-    
-    self.close()
-    
-    # Create DataFrame and export to CSV
-    df = pd.DataFrame(export_data)
-    
-    # Ensure XTSOL is the first column
-    if 'XTSOL' in df.columns:
-        cols = ['XTSOL'] + [col for col in df.columns if col != 'XTSOL']
-        df = df[cols]
-        
-    df.to_csv(output_file, index=False, encoding='iso-8859-1', sep=';')
-    
-    return len(export_data)
+
+    def export_products_csv(self, output_file, include_html=True, apply_overrides=True):
+        """Export products to CSV format for shop import"""
+        self.connect()
+
+        # Collect the property columns up front so the CSV header is complete
+        self.cursor.execute('SELECT DISTINCT property_name, language FROM Properties')
+        prop_columns = set(self.cursor.fetchall())
+        if apply_overrides:
+            self.cursor.execute('SELECT DISTINCT property_name, language FROM PropertyOverrides')
+            prop_columns.update(self.cursor.fetchall())
+
+        fieldnames = ['XTSOL', 'article_id', 'name', 'price', 'stock', 'category', 'p_desc.de', 'p_desc.en']
+        fieldnames += sorted(f"prop_{name}" for name, lang in prop_columns if lang == 'de')
+        fieldnames += sorted(f"prop_{name}.en" for name, lang in prop_columns if lang == 'en')
+
+        # One join streams every product with its properties, grouped per
+        # article. With overrides the MergedProperties view hands back
+        # final values (units already folded in), so no Python-side merge
+        # happens at all; the NULL keeps both row shapes identical.
+        if apply_overrides:
+            self.cursor.execute('''
+            SELECT p.article_id, p.name, p.price, p.stock, p.category,
+                   mp.property_name, mp.property_value, NULL, mp.language
+            FROM Products p
+            LEFT JOIN MergedProperties mp ON mp.article_id = p.article_id
+            ORDER BY p.article_id
+            ''')
+        else:
+            self.cursor.execute('''
+            SELECT p.article_id, p.name, p.price, p.stock, p.category,
+                   pr.property_name, pr.property_value, pr.property_unit, pr.language
+            FROM Products p
+            LEFT JOIN Properties pr ON pr.article_id = p.article_id
+            ORDER BY p.article_id
+            ''')
+
+        exported = 0
+
+        with open(output_file, 'w', encoding='iso-8859-1', newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=fieldnames, delimiter=';', restval='')
+            writer.writeheader()
+
+            # Rows are handed to the writer in batches: one writerows
+            # call per 1000 products instead of a Python-level call per row
+            row_batch = []
+
+            for article_id, product_rows in groupby(self.cursor, key=lambda r: r[0]):
+                product_rows = list(product_rows)
+                name, price, stock, category = product_rows[0][1:5]
+
+                # Organize properties by language
+                de_properties = {}
+                en_properties = {}
+
+                # First add regular properties
+                for row in product_rows:
+                    prop_name, prop_value, prop_unit, lang = row[5:]
+                    if prop_name is None:
+                        # Product without properties (LEFT JOIN padding)
+                        continue
+                    if lang == 'de':
+                        if prop_unit:
+                            de_properties[prop_name] = f"{prop_value} {prop_unit}"
+                        else:
+                            de_properties[prop_name] = prop_value
+                    elif lang == 'en':
+                        if prop_unit:
+                            en_properties[prop_name] = f"{prop_value} {prop_unit}"
+                        else:
+                            en_properties[prop_name] = prop_value
+
+                # Build HTML content if requested
+                p_desc_de = ""
+                p_desc_en = ""
+
+                if include_html:
+                    # Generate HTML tables for the descriptions; join is linear
+                    # in output size where += on a string is quadratic, and
+                    # escaping keeps values with <, > or & from breaking the
+                    # generated markup
+                    p_desc_de = "<table>" + "".join(
+                        f"<tr><td>{html.escape(str(prop_name))}</td><td>{html.escape(str(prop_value))}</td></tr>"
+                        for prop_name, prop_value in de_properties.items()
+                    ) + "</table>"
+                    p_desc_en = "<table>" + "".join(
+                        f"<tr><td>{html.escape(str(prop_name))}</td><td>{html.escape(str(prop_value))}</td></tr>"
+                        for prop_name, prop_value in en_properties.items()
+                    ) + "</table>"
+
+                # Create row for this product - adding XTSOL as a constant column
+                product_row = {
+                    'XTSOL': 'XTSOL',  # Adding the XTSOL column with constant value
+                    'article_id': article_id,
+                    'name': name,
+                    'price': price,
+                    'stock': stock,
+                    'category': category,
+                    'p_desc.de': p_desc_de,
+                    'p_desc.en': p_desc_en
+                }
+
+                # Add individual properties
+                for prop_name, prop_value in de_properties.items():
+                    product_row[f"prop_{prop_name}"] = prop_value
+
+                for prop_name, prop_value in en_properties.items():
+                    product_row[f"prop_{prop_name}.en"] = prop_value
+
+                row_batch.append(product_row)
+                exported += 1
+
+                if len(row_batch) >= 1000:
+                    writer.writerows(row_batch)
+                    row_batch.clear()
+
+            if row_batch:
+                writer.writerows(row_batch)
+
+        return exported
@@ -1,20 +1,228 @@
 """
 HTML Parser Module for extracting structured data from HTML tables
 """
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from collections import OrderedDict
+from functools import lru_cache
+import lxml.html
 import re
+from lxml.etree import ParserError, XMLSyntaxError
+
+# Parsed-table memo: SKU variants of one product family usually share an
+# identical description blob, so each distinct blob is parsed once. Keyed
+# by the content itself rather than hash() so collisions are impossible;
+# OrderedDict gives least-recently-used eviction at the size bound.
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_MAX = 4096
+
+# Only table markup is consulted, so the fallback parser can skip
+# building the rest of the DOM entirely
+_TABLE_STRAINER = SoupStrainer(['table', 'tr', 'th', 'td'])
+
+# The property alternation below never backtracks, so Google's RE2
+# (a linear-time DFA engine) scans large HTML blobs noticeably faster
+# when the optional pyre2 package is installed
+try:
+    import re2 as _re_scan
+except ImportError:
+    _re_scan = re
+
+# Key-value pairs outside tables: plain "name: value" text or a
+# <strong> label followed by the value, matched in one alternation so
+# the haystack is scanned once
+_PROPS_COMBINED = _re_scan.compile(r'(\w+):\s*([^<]+)|<strong>([^<]+)</strong>\s*([^<]+)')
+
+# Precompiled pattern for temperature-range normalization
+_TEMP_RANGE_RE = re.compile(r'(-?\d+)\s*°C\s*bis\s*(\+?\d+)\s*°C')
+
+def _extract_number_unit(value):
+    """
+    Scan a value like "123,4 mm" for its number and unit.
+
+    Almost every numeric property value already has this exact shape,
+    so a single left-to-right walk over the string beats spinning up
+    the regex engine for it: find the first digit run, allow one
+    decimal separator, then take the trailing letters (including °)
+    as the unit.
+
+    Returns:
+        tuple: (float or None, unit str or None)
+    """
+    length = len(value)
+    i = 0
+    while i < length and not value[i].isdigit():
+        i += 1
+    if i == length:
+        return None, None
+
+    start = i
+    while i < length and value[i].isdigit():
+        i += 1
+    # At most one decimal separator, and only if digits follow it
+    if i + 1 < length and value[i] in ',.' and value[i + 1].isdigit():
+        i += 1
+        while i < length and value[i].isdigit():
+            i += 1
+
+    number = float(value[start:i].replace(',', '.'))
+
+    while i < length and value[i].isspace():
+        i += 1
+    unit_start = i
+    while i < length and (value[i].isalpha() or value[i] == '°'):
+        i += 1
+
+    return number, value[unit_start:i] or None
+
+# Map common German property names to standardized names
+DE_TO_STANDARD = {
+    'Farbe': 'color',
+    'Material': 'material',
+    'Zugkraft': 'tensile_strength',
+    'Max. Bündeldurchmesser': 'max_bundle_diameter',
+    'Min. Bündeldurchmesser': 'min_bundle_diameter',
+    'Temperaturbeständigkeit': 'temperature_resistance',
+    'Min. Installationstemperatur': 'min_installation_temperature',
+    'Zulassungen': 'certifications',
+    'Verpackungseinheit': 'packaging_unit',
+    'Isolationsmaterial': 'insulation_material',
+    'Werkstoff des Leiters': 'conductor_material',
+    'Länge': 'length',
+    'Nenngröße': 'nominal_size',
+    'Kabelquerschnitt': 'cable_cross_section'
+    # Add more mappings as needed
+}
+
+# Properties whose values carry a numeric magnitude and unit
+_NUMERIC_PROPS = frozenset({
+    'tensile_strength', 'max_bundle_diameter', 'min_bundle_diameter', 'length'
+})
+
+# Translation table for the snake_case fallback in name normalization
+_SPACE_TO_UNDERSCORE = str.maketrans(' ', '_')
+
+@lru_cache(maxsize=8192)
+def _normalize_name(property_name, language):
+    """
+    Normalize a property name to its standardized form (cached).
+
+    This is the pure name-mapping half of property normalization; it
+    never touches the value-parsing regexes, so callers that only need
+    the standardized key stay on a dict-lookup fast path.
+    """
+    if language == 'de':
+        standard_name = DE_TO_STANDARD.get(property_name)
+        if standard_name is not None:
+            return standard_name
+
+    # Otherwise just convert to lowercase with underscores
+    return property_name.lower().translate(_SPACE_TO_UNDERSCORE)
+
+@lru_cache(maxsize=8192)
+def _normalize_value(standard_name, property_value):
+    """
+    Normalize a property value for a standardized name (cached).
+
+    Returns:
+        tuple: (normalized_value, unit)
+    """
+    normalized_value = property_value
+    unit = None
+
+    # Extract units for numeric properties
+    if standard_name in _NUMERIC_PROPS:
+        # Extract number and unit with the single-pass scanner
+        number, scanned_unit = _extract_number_unit(property_value)
+        if number is not None:
+            normalized_value = number
+            unit = scanned_unit
+
+    # Special handling for temperature ranges
+    elif standard_name == 'temperature_resistance':
+        match = _TEMP_RANGE_RE.search(property_value)
+        if match:
+            min_temp, max_temp = match.group(1), match.group(2)
+            normalized_value = f"{min_temp} to {max_temp}"
+            unit = "°C"
+
+    return normalized_value, unit
 
 class HTMLParser:
     """Class to handle HTML parsing for product descriptions"""
     
     def parse_html_table(self, html_content):
-        """Parse HTML tables from product descriptions"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        """Parse HTML tables from product descriptions (memoized)"""
+        cached = _PARSE_CACHE.get(html_content)
+        if cached is not None:
+            _PARSE_CACHE.move_to_end(html_content)
+            # Copy so a caller mutating the result cannot poison the cache
+            return dict(cached)
+
+        properties = self._parse_html_table_uncached(html_content)
+
+        _PARSE_CACHE[html_content] = properties
+        if len(_PARSE_CACHE) > _PARSE_CACHE_MAX:
+            _PARSE_CACHE.popitem(last=False)
+
+        return dict(properties)
+
+    def _parse_html_table_uncached(self, html_content):
+        """Do the actual parse behind the parse_html_table memo"""
+        try:
+            tree = lxml.html.fromstring(html_content)
+        except (ParserError, XMLSyntaxError, ValueError):
+            # Fall back to BeautifulSoup for markup lxml cannot handle
+            return self._parse_html_table_soup(html_content)
+
+        # One XPath call returns every table row, wherever it is nested,
+        # which also covers rows that sit in a div without a <table>
+        properties = self._parse_lxml_rows(tree.xpath('//tr'))
+
+        # Look for key-value pairs outside tables (divs or paragraphs),
+        # but only when the tables yielded nothing
+        if not properties:
+            self._scan_property_patterns(html_content, properties)
+
+        return properties
+
+    def _scan_property_patterns(self, html_content, properties):
+        """Regex fallback scan for key-value pairs in loose markup"""
+        for match in _PROPS_COMBINED.finditer(html_content):
+            property_name, property_value = match.group(1), match.group(2)
+            if property_name is None:
+                # The <strong> alternative matched instead
+                property_name, property_value = match.group(3), match.group(4)
+            property_name = property_name.strip()
+            property_value = property_value.strip()
+            if property_name and property_value and property_name not in properties:
+                properties[property_name] = property_value
+
+    def _parse_lxml_rows(self, rows):
+        """Parse lxml table row elements into property key-value pairs"""
         properties = {}
-        
+
+        for row in rows:
+            cells = row.xpath('./th | ./td')
+            if len(cells) >= 2:
+                # First cell is usually property name
+                property_name = cells[0].text_content().strip().rstrip(':')
+                # Second cell is usually property value
+                property_value = cells[1].text_content().strip()
+
+                # Store property if not empty
+                if property_name and property_value:
+                    properties[property_name] = property_value
+
+        return properties
+
+    def _parse_html_table_soup(self, html_content):
+        """BeautifulSoup fallback used when lxml rejects the markup"""
+        soup = BeautifulSoup(html_content, 'html.parser', parse_only=_TABLE_STRAINER)
+        properties = {}
+
         # Find tables in the HTML
         tables = soup.find_all('table')
-        
+
         # If no tables found directly, look for table rows which might be in a div
         if not tables:
             rows = soup.find_all('tr')
@@ -27,23 +235,14 @@ class HTMLParser:
                 rows = table.find_all('tr')
                 table_properties = self._parse_rows(rows)
                 properties.update(table_properties)
-                
-        # Look for properties outside tables (sometimes they appear as key-value pairs in divs or paragraphs)
-        property_patterns = [
-            r'(\w+):\s*([^<]+)', 
-            r'<strong>([^<]+)</strong>\s*([^<]+)'
-        ]
-        
-        for pattern in property_patterns:
-            matches = re.findall(pattern, str(soup))
-            for match in matches:
-                property_name = match[0].strip()
-                property_value = match[1].strip()
-                if property_name and property_value and property_name not in properties:
-                    properties[property_name] = property_value
-        
+
+        # Same fallback scan, on the original string rather than a
+        # re-serialized soup
+        if not properties:
+            self._scan_property_patterns(html_content, properties)
+
         return properties
-    
+
     def _parse_rows(self, rows):
         """Parse table rows into property key-value pairs"""
         properties = {}
@@ -67,58 +266,8 @@ class HTMLParser:
     
     def normalize_property(self, property_name, property_value, language='de'):
         """Normalize property names and values"""
-        # Map common German property names to standardized names
-        de_to_standard = {
-            'Farbe': 'color',
-            'Material': 'material',
-            'Zugkraft': 'tensile_strength',
-            'Max. Bündeldurchmesser': 'max_bundle_diameter',
-            'Min. Bündeldurchmesser': 'min_bundle_diameter',
-            'Temperaturbeständigkeit': 'temperature_resistance',
-            'Min. Installationstemperatur': 'min_installation_temperature',
-            'Zulassungen': 'certifications',
-            'Verpackungseinheit': 'packaging_unit',
-            'Isolationsmaterial': 'insulation_material',
-            'Werkstoff des Leiters': 'conductor_material',
-            'Länge': 'length',
-            'Nenngröße': 'nominal_size',
-            'Kabelquerschnitt': 'cable_cross_section'
-            # Add more mappings as needed
-        }
-        
-        # Normalize property name
-        if language == 'de':
-            standard_name = de_to_standard.get(property_name, property_name.lower().replace(' ', '_'))
-        else:
-            # For English, just convert to lowercase with underscores
-            standard_name = property_name.lower().replace(' ', '_')
-        
-        # Process value based on property type
-        normalized_value = property_value
-        unit = None
-        
-        # Extract units for numeric properties
-        if standard_name in ['tensile_strength', 'max_bundle_diameter', 'min_bundle_diameter', 'length']:
-            # Extract number and unit
-            match = re.search(r'(\d+(?:[,.]\d+)?)\s*(\w+)?', property_value)
-            if match:
-                numeric_value = match.group(1).replace(',', '.')
-                try:
-                    normalized_value = float(numeric_value)
-                    if match.group(2):
-                        unit = match.group(2)
-                except ValueError:
-                    # Keep original if conversion fails
-                    pass
-        
-        # Special handling for temperature ranges
-        elif standard_name == 'temperature_resistance':
-            match = re.search(r'(-?\d+)\s*°C\s*bis\s*(\+?\d+)\s*°C', property_value)
-            if match:
-                min_temp, max_temp = match.group(1), match.group(2)
-                normalized_value = f"{min_temp} to {max_temp}"
-                unit = "°C"
-        
+        standard_name = _normalize_name(property_name, language)
+        normalized_value, unit = _normalize_value(standard_name, property_value)
         return standard_name, normalized_value, unit
     
     def detect_new_properties(self, properties_dict, known_properties):
@@ -127,18 +276,19 @@ class HTMLParser:
         
         Args:
             properties_dict (dict): Extracted properties from HTML
-            known_properties (list): List of known property names
+            known_properties (frozenset): Known property names; any container
+                works, but a set keeps the membership check O(1)
             
         Returns:
             list: List of new property names
         """
         new_properties = []
         for prop_name in properties_dict.keys():
-            # Normalize the property name
-            std_name, _, _ = self.normalize_property(prop_name, "", "")
-            
+            # Normalize the property name (name-only fast path)
+            std_name = _normalize_name(prop_name, "")
+
             # Check if the normalized property is already known
             if std_name not in known_properties:
                 new_properties.append(std_name)
-                
+
         return new_properties
@@ -1,9 +1,191 @@
 """
 Property Manager Module for managing product properties
 """
+import logging
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from collections import defaultdict
+
 import pandas as pd
 from core.html_parser import HTMLParser
 
+try:
+    from pyarrow import csv as pa_csv
+    HAVE_PYARROW = True
+except ImportError:
+    # Fall back to the chunked pandas reader below
+    HAVE_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+# SQL literals hoisted to module level so the same string objects hit
+# sqlite3's statement cache on every call
+_SQL_UPSERT_DEF = '''INSERT INTO PropertyDefinitions (name_de, name_en, data_type, expected_unit)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(name_de) DO UPDATE SET
+    name_en = excluded.name_en,
+    data_type = excluded.data_type,
+    expected_unit = excluded.expected_unit'''
+
+_SQL_UPSERT_DEF_EN = '''INSERT INTO PropertyDefinitions (name_de, name_en, data_type, expected_unit)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(name_en) DO UPDATE SET
+    name_de = COALESCE(excluded.name_de, name_de),
+    data_type = excluded.data_type,
+    expected_unit = excluded.expected_unit'''
+
+_SQL_MERGED_PROPS = '''SELECT property_name, property_value, property_unit, language, 0 AS prio
+FROM Properties WHERE article_id = ?
+UNION ALL
+SELECT c.property_name, c.override_value, NULL, c.language, 1
+FROM CategoryPropertyOverrides c
+JOIN Products p ON p.category = c.category
+WHERE p.article_id = ?
+UNION ALL
+SELECT property_name, override_value, NULL, language, 2
+FROM PropertyOverrides WHERE article_id = ?
+ORDER BY prio'''
+
+_SQL_GET_CATEGORY = 'SELECT category FROM Products WHERE article_id = ?'
+_SQL_CAT_OVERRIDES = 'SELECT property_name, override_value, language FROM CategoryPropertyOverrides WHERE category = ?'
+_SQL_ART_OVERRIDES = 'SELECT property_name, override_value, language FROM PropertyOverrides WHERE article_id = ?'
+
+# SQLite accepts at most 999 bound parameters per statement
+_IN_CHUNK_SIZE = 900
+
+def _chunked(values, size=_IN_CHUNK_SIZE):
+    """Yield successive slices of at most size elements"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+# Description columns scanned for properties, with their language codes
+_DESC_COLUMNS = (('p_desc.de', 'de'), ('p_desc.en', 'en'))
+
+def _iter_description_batches(csv_file, encoding):
+    """
+    Yield (language, values) batches of description HTML from a CSV.
+
+    Uses pyarrow's multithreaded CSV reader when available — it streams
+    record batches without building a DataFrame — and falls back to the
+    chunked pandas reader otherwise.
+    """
+    if HAVE_PYARROW:
+        reader = pa_csv.open_csv(
+            csv_file,
+            read_options=pa_csv.ReadOptions(encoding=encoding),
+            # Description cells hold quoted HTML with embedded newlines;
+            # without newlines_in_values pyarrow rejects the file
+            parse_options=pa_csv.ParseOptions(delimiter=';', newlines_in_values=True)
+        )
+        with reader:
+            for batch in reader:
+                for column, language in _DESC_COLUMNS:
+                    index = batch.schema.get_field_index(column)
+                    if index < 0:
+                        continue
+                    values = [value for value in batch.column(index).to_pylist() if value]
+                    if values:
+                        yield language, values
+        return
+
+    chunks = pd.read_csv(
+        csv_file, encoding=encoding, sep=';',
+        chunksize=50_000,
+        usecols=lambda column: column in ('p_desc.de', 'p_desc.en'),
+        dtype=str
+    )
+    for chunk in chunks:
+        for column, language in _DESC_COLUMNS:
+            if column in chunk.columns:
+                values = chunk[column].dropna().tolist()
+                if values:
+                    yield language, values
+
+# Parser instance per worker process, created lazily on first task
+_worker_parser = None
+
+def _parse_html(html_content):
+    """Parse one HTML description (module-level so it pickles to workers)"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = HTMLParser()
+    return _worker_parser.parse_html_table(html_content)
+
+class PropertyTable:
+    """
+    Columnar (structure-of-arrays) store for merged product properties.
+
+    Names, values and language codes live in parallel arrays tied
+    together by a (name, lang)-keyed index, so applying an override is
+    one dict probe plus one list write, and the arrays stay contiguous
+    for a future compiled apply_many kernel.
+    """
+
+    _LANG_CODES = {'de': 0, 'en': 1}
+    _LANG_NAMES = ('de', 'en')
+
+    def __init__(self):
+        self.names = []
+        self.values = []
+        self.langs = bytearray()
+        self.index = {}
+
+    def apply(self, name, value, lang):
+        """Insert or overwrite the value for (name, lang)"""
+        code = self._LANG_CODES.get(lang)
+        if code is None:
+            return
+        key = (name, code)
+        i = self.index.get(key)
+        if i is None:
+            self.index[key] = len(self.names)
+            self.names.append(name)
+            self.values.append(value)
+            self.langs.append(code)
+        else:
+            self.values[i] = value
+
+    def apply_many(self, rows):
+        """
+        Fold an iterable of (name, value, unit, lang, prio) rows into the
+        table.
+
+        This is the hot kernel of the override merge, so every attribute
+        and method used inside the loop is bound to a local first; the
+        columnar layout keeps the door open for a compiled replacement,
+        but in this build the specialized Python loop is the kernel.
+        """
+        lang_codes = self._LANG_CODES
+        index = self.index
+        names = self.names
+        values = self.values
+        langs = self.langs
+        index_get = index.get
+
+        for name, value, unit, lang, prio in rows:
+            code = lang_codes.get(lang)
+            if code is None:
+                continue
+            if unit:
+                value = f"{value} {unit}"
+            key = (name, code)
+            i = index_get(key)
+            if i is None:
+                index[key] = len(names)
+                names.append(name)
+                values.append(value)
+                langs.append(code)
+            else:
+                values[i] = value
+
+    def to_dicts(self):
+        """Reconstitute the {'de': ..., 'en': ...} shape callers expect"""
+        result = {'de': {}, 'en': {}}
+        lang_names = self._LANG_NAMES
+        for name, value, code in zip(self.names, self.values, self.langs):
+            result[lang_names[code]][name] = value
+        return result
+
 class PropertyManager:
     """Class for managing product properties and their definitions"""
     
@@ -16,10 +198,36 @@ class PropertyManager:
         """
         self.db_manager = db_manager
         self.html_parser = HTMLParser()
-        
-    def load_property_definitions(self):
-        """Load all property definitions from the database"""
-        return self.db_manager.get_property_definitions()
+
+        # Definitions cache; the version counter is bumped on every
+        # definition write so stale entries are never served
+        self._defs_cache = None
+        self._defs_cache_version = -1
+        self._defs_version = 0
+
+        # Per-article property cache, cleared whenever an override changes
+        self._props_cache = {}
+
+        # Known-name set derived from the definitions, same invalidation
+        self._known_names_cache = None
+        self._known_names_version = -1
+
+    def load_property_definitions(self, cache=True):
+        """
+        Load all property definitions from the database.
+
+        Args:
+            cache (bool): Serve from the in-memory cache when it is current
+
+        Returns:
+            list: List of property definition rows
+        """
+        if cache and self._defs_cache is not None and self._defs_cache_version == self._defs_version:
+            return self._defs_cache
+
+        self._defs_cache = self.db_manager.get_property_definitions()
+        self._defs_cache_version = self._defs_version
+        return self._defs_cache
     
     def add_property_definition(self, name_de, name_en, data_type, expected_unit):
         """
@@ -35,33 +243,49 @@ class PropertyManager:
             bool: True if successful, False otherwise
         """
         conn = self.db_manager.connect()
-        cursor = conn.cursor()
-        
+
         try:
-            # Check if property definition exists
-            cursor.execute('SELECT property_id FROM PropertyDefinitions WHERE name_de = ? OR name_en = ?', (name_de, name_en))
-            exists = cursor.fetchone()
-            
-            if exists:
-                # Update existing definition
-                cursor.execute(
-                    'UPDATE PropertyDefinitions SET name_de = ?, name_en = ?, data_type = ?, expected_unit = ? WHERE property_id = ?',
-                    (name_de, name_en, data_type, expected_unit, exists[0])
-                )
+            # Upsert keyed on the unique German name; one round-trip
+            # instead of the previous SELECT + UPDATE/INSERT pair. A row
+            # may instead match on its English name (always when name_de
+            # is NULL, since NULL never conflicts), so fall back to an
+            # upsert keyed on name_en, mirroring the per-language split
+            # in add_new_properties_bulk
+            if name_de is None:
+                conn.execute(_SQL_UPSERT_DEF_EN, (name_de, name_en, data_type, expected_unit))
             else:
-                # Insert new definition
-                cursor.execute(
-                    'INSERT INTO PropertyDefinitions (name_de, name_en, data_type, expected_unit) VALUES (?, ?, ?, ?)',
-                    (name_de, name_en, data_type, expected_unit)
-                )
-                
+                try:
+                    conn.execute(_SQL_UPSERT_DEF, (name_de, name_en, data_type, expected_unit))
+                except sqlite3.IntegrityError:
+                    conn.execute(_SQL_UPSERT_DEF_EN, (name_de, name_en, data_type, expected_unit))
             conn.commit()
+            self._defs_version += 1
+            return True
+        except sqlite3.Error:
+            logger.exception("Error adding property definition %s", name_de)
+            return False
+
+    def add_property_definitions_bulk(self, definitions):
+        """
+        Add or update many property definitions in a single transaction.
+
+        Args:
+            definitions (list): List of (name_de, name_en, data_type, expected_unit) tuples
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        conn = self.db_manager.connect()
+
+        try:
+            # One prepared statement and one commit for the whole batch
+            with conn:
+                conn.executemany(_SQL_UPSERT_DEF, definitions)
+            self._defs_version += 1
             return True
-        except Exception as e:
-            print(f"Error adding property definition: {str(e)}")
+        except sqlite3.Error:
+            logger.exception("Error adding property definitions in bulk")
             return False
-        finally:
-            self.db_manager.close()
     
     def get_properties_for_product(self, article_id):
         """
@@ -73,45 +297,49 @@ class PropertyManager:
         Returns:
             dict: Dictionary with property values by language
         """
-        # Get regular properties
-        properties = self.db_manager.get_product_properties(article_id)
-        
-        # Get overrides
-        article_overrides, category_overrides = self.db_manager.get_property_overrides(article_id)
-        
-        # Organize properties by language
-        de_properties = {}
-        en_properties = {}
-        
-        # First add regular properties
-        for prop_name, prop_value, prop_unit, lang in properties:
-            if lang == 'de':
-                if prop_unit:
-                    de_properties[prop_name] = f"{prop_value} {prop_unit}"
-                else:
-                    de_properties[prop_name] = prop_value
-            elif lang == 'en':
-                if prop_unit:
-                    en_properties[prop_name] = f"{prop_value} {prop_unit}"
-                else:
-                    en_properties[prop_name] = prop_value
-        
-        # Apply category overrides
-        for prop_name, override_value, lang in category_overrides:
-            if lang == 'de':
-                de_properties[prop_name] = override_value
-            elif lang == 'en':
-                en_properties[prop_name] = override_value
-        
-        # Apply article-specific overrides (higher priority)
-        for prop_name, override_value, lang in article_overrides:
-            if lang == 'de':
-                de_properties[prop_name] = override_value
-            elif lang == 'en':
-                en_properties[prop_name] = override_value
-                
-        return {'de': de_properties, 'en': en_properties}
+        # Serve repeated lookups from memory; override writes clear this
+        cached = self._props_cache.get(article_id)
+        if cached is not None:
+            return cached
+
+        conn = self.db_manager.connect()
+
+        # One round-trip: base properties, category overrides and article
+        # overrides come back as a single result set ordered by priority,
+        # so a plain dict assignment makes the last (highest) write win
+        cursor = conn.execute(_SQL_MERGED_PROPS, (article_id, article_id, article_id))
+
+        # Fold the priority-ordered rows into one columnar table — plain
+        # assignment applies the overrides — then reconstitute the
+        # per-language dict shape at the end
+        table = PropertyTable()
+        table.apply_many(cursor)
+
+        result = table.to_dicts()
+
+        # Keep the cache bounded; a full clear is rare and cheap
+        if len(self._props_cache) >= 128:
+            self._props_cache.clear()
+        self._props_cache[article_id] = result
+        return result
     
+    def invalidate_properties_cache(self, article_id=None):
+        """
+        Drop cached merged properties after an external write.
+
+        Callers that write through db_manager directly (instead of the
+        set_*_override methods, which clear the cache themselves) must
+        call this so stale merges are not served afterwards.
+
+        Args:
+            article_id (str): Article whose entry to drop, or None to
+                clear the whole cache
+        """
+        if article_id is None:
+            self._props_cache.clear()
+        else:
+            self._props_cache.pop(article_id, None)
+
     def apply_overrides(self, article_id, properties):
         """
         Apply article-specific and category-based overrides.
@@ -124,11 +352,9 @@ class PropertyManager:
             dict: Dictionary with applied overrides
         """
         conn = self.db_manager.connect()
-        cursor = conn.cursor()
-        
+
         # Get article category
-        cursor.execute('SELECT category FROM Products WHERE article_id = ?', (article_id,))
-        result = cursor.fetchone()
+        result = conn.execute(_SQL_GET_CATEGORY, (article_id,)).fetchone()
         category = result[0] if result and result[0] else None
         
         # Copy of properties
@@ -136,11 +362,7 @@ class PropertyManager:
         
         # Apply category-based overrides (if category is known)
         if category:
-            cursor.execute(
-                'SELECT property_name, override_value, language FROM CategoryPropertyOverrides WHERE category = ?',
-                (category,)
-            )
-            category_overrides = cursor.fetchall()
+            category_overrides = conn.execute(_SQL_CAT_OVERRIDES, (category,)).fetchall()
             
             for prop_name, override_value, language in category_overrides:
                 # Only override property if it exists in the corresponding language
@@ -149,19 +371,79 @@ class PropertyManager:
                     overridden_properties[key] = override_value
         
         # Apply article-specific overrides (higher priority)
-        cursor.execute(
-            'SELECT property_name, override_value, language FROM PropertyOverrides WHERE article_id = ?',
-            (article_id,)
-        )
-        article_overrides = cursor.fetchall()
+        article_overrides = conn.execute(_SQL_ART_OVERRIDES, (article_id,)).fetchall()
         
         for prop_name, override_value, language in article_overrides:
             key = (prop_name, language)
             overridden_properties[key] = override_value
         
-        self.db_manager.close()
         return overridden_properties
     
+    def apply_overrides_bulk(self, properties_by_article):
+        """
+        Apply overrides for many articles with three batched queries.
+
+        The per-article variant issues two queries per call; this one
+        fetches categories, category overrides and article overrides in
+        IN-chunked statements and fans the rows out in Python.
+
+        Args:
+            properties_by_article (dict): {article_id: {(name, language): value}}
+
+        Returns:
+            dict: {article_id: dict with applied overrides}
+        """
+        conn = self.db_manager.connect()
+        article_ids = list(properties_by_article)
+        overridden = {
+            article_id: properties.copy()
+            for article_id, properties in properties_by_article.items()
+        }
+
+        # Resolve each article's category
+        categories = {}
+        for chunk in _chunked(article_ids):
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f'SELECT article_id, category FROM Products WHERE article_id IN ({placeholders})',
+                chunk
+            ).fetchall()
+            categories.update(rows)
+
+        # Category overrides, grouped once and applied per article
+        category_overrides = defaultdict(list)
+        distinct_categories = sorted({c for c in categories.values() if c})
+        for chunk in _chunked(distinct_categories):
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f'SELECT category, property_name, override_value, language '
+                f'FROM CategoryPropertyOverrides WHERE category IN ({placeholders})',
+                chunk
+            ).fetchall()
+            for category, prop_name, override_value, language in rows:
+                category_overrides[category].append((prop_name, override_value, language))
+
+        for article_id, category in categories.items():
+            properties = overridden[article_id]
+            for prop_name, override_value, language in category_overrides.get(category, ()):
+                # Only override property if it exists in the corresponding language
+                key = (prop_name, language)
+                if key in properties:
+                    properties[key] = override_value
+
+        # Article-specific overrides (higher priority)
+        for chunk in _chunked(article_ids):
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f'SELECT article_id, property_name, override_value, language '
+                f'FROM PropertyOverrides WHERE article_id IN ({placeholders})',
+                chunk
+            ).fetchall()
+            for article_id, prop_name, override_value, language in rows:
+                overridden[article_id][(prop_name, language)] = override_value
+
+        return overridden
+
     def set_property_override(self, article_id, property_name, override_value, language):
         """
         Set an override for a property of a specific article
@@ -177,9 +459,10 @@ class PropertyManager:
         """
         try:
             self.db_manager.store_property_override(article_id, property_name, override_value, language)
+            self._props_cache.clear()
             return True
-        except Exception as e:
-            print(f"Error setting property override: {str(e)}")
+        except sqlite3.Error:
+            logger.exception("Error setting property override for %s", article_id)
             return False
     
     def set_category_property_override(self, category, property_name, override_value, language):
@@ -197,11 +480,60 @@ class PropertyManager:
         """
         try:
             self.db_manager.store_category_property_override(category, property_name, override_value, language)
+            self._props_cache.clear()
             return True
-        except Exception as e:
-            print(f"Error setting category property override: {str(e)}")
+        except sqlite3.Error:
+            logger.exception("Error setting category property override for %s", category)
             return False
     
+    def _get_known_property_names(self):
+        """Return the frozenset of known property names, cached per version"""
+        if self._known_names_cache is None or self._known_names_version != self._defs_version:
+            self._known_names_cache = frozenset(
+                name
+                for definition in self.load_property_definitions()
+                for name in (definition[0], definition[1])
+                if name
+            )
+            self._known_names_version = self._defs_version
+        return self._known_names_cache
+
+    def set_property_overrides_bulk(self, overrides):
+        """
+        Set many article property overrides in one transaction.
+
+        Args:
+            overrides (list): List of (article_id, property_name, override_value, language) tuples
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            self.db_manager.store_property_overrides_bulk(overrides)
+            self._props_cache.clear()
+            return True
+        except sqlite3.Error:
+            logger.exception("Error setting property overrides in bulk")
+            return False
+
+    def set_category_property_overrides_bulk(self, overrides):
+        """
+        Set many category property overrides in one transaction.
+
+        Args:
+            overrides (list): List of (category, property_name, override_value, language) tuples
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            self.db_manager.store_category_property_overrides_bulk(overrides)
+            self._props_cache.clear()
+            return True
+        except sqlite3.Error:
+            logger.exception("Error setting category property overrides in bulk")
+            return False
+
     def detect_new_properties(self, csv_file, encoding='iso-8859-1'):
         """
         Detect new properties in a CSV file
@@ -213,40 +545,28 @@ class PropertyManager:
         Returns:
             list: List of new properties
         """
-        # Load CSV file
-        df = pd.read_csv(csv_file, encoding=encoding, sep=';')
-        
-        # Load known properties
-        conn = self.db_manager.connect()
-        cursor = conn.cursor()
-        cursor.execute('SELECT name_de, name_en FROM PropertyDefinitions')
-        definitions = cursor.fetchall()
-        self.db_manager.close()
-        
-        # Create list of known property names
-        known_properties = []
-        for name_de, name_en in definitions:
-            if name_de:
-                known_properties.append(name_de)
-            if name_en:
-                known_properties.append(name_en)
-        
-        # Scan HTML contents for new properties
+        # Known names as a frozenset, rebuilt only when definitions change
+        known_properties = self._get_known_property_names()
+
+        # Parsing HTML is pure CPU, so deduplicated descriptions are
+        # fanned out to a process pool; detection of unknown names stays
+        # in this process where the known set lives
         new_properties = set()
-        
-        for index, row in df.iterrows():
-            # Process German description
-            if 'p_desc.de' in df.columns and pd.notna(row['p_desc.de']):
-                html_content = row['p_desc.de']
-                properties = self.html_parser.parse_html_table(html_content)
-                new_props_de = self.html_parser.detect_new_properties(properties, known_properties)
-                new_properties.update([(prop, 'de') for prop in new_props_de])
-                
-            # Process English description
-            if 'p_desc.en' in df.columns and pd.notna(row['p_desc.en']):
-                html_content = row['p_desc.en']
-                properties = self.html_parser.parse_html_table(html_content)
-                new_props_en = self.html_parser.detect_new_properties(properties, known_properties)
-                new_properties.update([(prop, 'en') for prop in new_props_en])
-                
+        detect = self.html_parser.detect_new_properties
+
+        # Memo of parse results for this scan: identical descriptions recur
+        # across SKUs and across the de/en columns, and each distinct HTML
+        # string needs parsing exactly once
+        parsed = {}
+
+        with ProcessPoolExecutor() as executor:
+            for language, htmls in _iter_description_batches(csv_file, encoding):
+                unique_htmls = set(htmls)
+                unseen = [html for html in unique_htmls if html not in parsed]
+                parsed.update(zip(unseen, executor.map(_parse_html, unseen, chunksize=256)))
+                for html in unique_htmls:
+                    new_properties.update(
+                        (prop, language) for prop in detect(parsed[html], known_properties)
+                    )
+
         return list(new_properties)
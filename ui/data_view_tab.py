@@ -1,12 +1,132 @@
 """
 Data View Tab Module for viewing and editing product data
 """
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-                            QTableWidgetItem, QGroupBox, QComboBox, QLabel, QMessageBox,
-                            QDialog, QFormLayout, QLineEdit)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+                            QGroupBox, QComboBox, QLabel, QMessageBox,
+                            QDialog, QFormLayout, QLineEdit, QHeaderView)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, QSignalBlocker
+from collections import OrderedDict
 from core.property_manager import PropertyManager
 
+# Unit suffixes recognized when splitting display values; hoisted so the
+# property loop does not rebuild the collection per row
+_UNITS = frozenset(("mm", "cm", "m", "g", "kg", "°C", "V", "A"))
+
+class ProductTableModel(QAbstractTableModel):
+    """
+    Table model over the raw product tuples.
+
+    Qt only asks data() for the cells currently on screen, and rows are
+    fetched from the database in 200-row pages as the user scrolls, so
+    switching to the tab costs one page regardless of catalog size.
+    """
+
+    _HEADERS = ("Article ID", "Name", "Price", "Stock", "Category")
+    _PAGE_SIZE = 200
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self._products = []
+        self._category = None
+        self._total = 0
+
+    def reset(self, category=None):
+        """Restart pagination for the given category filter"""
+        self.beginResetModel()
+        self._category = category
+        self._products = []
+        # One cheap COUNT(*) tells Qt how much is left to fetch
+        self._total = self.db_manager.count_products(category)
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._products) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        rows = self.db_manager.get_products_page(
+            self._category, self._PAGE_SIZE, len(self._products)
+        )
+        if not rows:
+            return
+        first = len(self._products)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        # Convert to display strings once per page; data() is called
+        # repeatedly for the same cells while scrolling and repainting
+        self._products.extend(
+            tuple("" if value is None else str(value) for value in row)
+            for row in rows
+        )
+        self.endInsertRows()
+
+    def article_id(self, row):
+        """Return the article ID of the product in the given row"""
+        return self._products[row][0]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._products)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self._products[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._HEADERS[section]
+        return None
+
+class PropertyTableModel(QAbstractTableModel):
+    """Table model over the (name, value, unit, language) property rows"""
+
+    _HEADERS = ("Property", "Value", "Unit", "Language")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._properties = []
+        self._display = []
+        self._order = []
+
+    def set_properties(self, properties):
+        """Replace the displayed properties with a new list of tuples"""
+        self.beginResetModel()
+        self._properties = properties
+        # Display strings are built once per reset; the raw tuples stay
+        # untouched for property_at since the edit dialogs need them
+        self._display = [
+            tuple("" if value is None else str(value) for value in row)
+            for row in properties
+        ]
+        # Display order by property name via an index array
+        self._order = sorted(range(len(properties)),
+                             key=lambda i: properties[i][0])
+        self.endResetModel()
+
+    def property_at(self, row):
+        """Return the (name, value, unit, language) tuple in the given row"""
+        return self._properties[self._order[row]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._properties)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self._display[self._order[index.row()]][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._HEADERS[section]
+        return None
+
 class PropertyEditDialog(QDialog):
     """Dialog for editing property values"""
     
@@ -68,35 +188,58 @@ class PropertyEditDialog(QDialog):
 class DataViewTab(QWidget):
     """Tab for viewing and editing product data"""
     
-    def __init__(self, db_manager, parent=None):
+    def __init__(self, db_manager, property_manager=None, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
-        self.property_manager = PropertyManager(db_manager)
+        # Normally the application-wide instance from MainWindow; a
+        # private one is only built when the tab is used standalone
+        self.property_manager = property_manager or PropertyManager(db_manager)
+        # Built display rows per article, so arrow-keying back to a
+        # recently viewed product skips the fetch and rebuild entirely
+        self._prop_cache = OrderedDict()
+        self._loaded_once = False
         self.init_ui()
         
     def init_ui(self):
         """Initialize user interface"""
         layout = QVBoxLayout()
-        
+
+        # Debounce timers: rapid combo changes or arrow-keying through
+        # the product list restart the timer, so only the settled input
+        # triggers a query and table rebuild
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(200)
+        self._filter_timer.timeout.connect(self.filter_products_by_category)
+
+        self._selection_timer = QTimer(self)
+        self._selection_timer.setSingleShot(True)
+        self._selection_timer.setInterval(200)
+        self._selection_timer.timeout.connect(self.load_properties)
+
         # Filter area
         filter_layout = QHBoxLayout()
         filter_layout.addWidget(QLabel("Filter by Category:"))
         self.category_combo = QComboBox()
         self.category_combo.addItem("All Categories", None)
-        self.category_combo.currentIndexChanged.connect(self.filter_products_by_category)
+        self.category_combo.currentIndexChanged.connect(self._schedule_filter)
         filter_layout.addWidget(self.category_combo)
         
         # Product list
         list_group = QGroupBox("Products")
         list_layout = QVBoxLayout()
         
-        self.product_table = QTableWidget()
-        self.product_table.setColumnCount(5)
-        self.product_table.setHorizontalHeaderLabels(["Article ID", "Name", "Price", "Stock", "Category"])
-        self.product_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.product_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.product_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.product_table.selectionModel().selectionChanged.connect(self.load_properties)
+        self.product_model = ProductTableModel(self.db_manager, self)
+        self.product_table = QTableView()
+        self.product_table.setModel(self.product_model)
+        self.product_table.setSelectionBehavior(QTableView.SelectRows)
+        self.product_table.setSelectionMode(QTableView.SingleSelection)
+        self.product_table.setEditTriggers(QTableView.NoEditTriggers)
+        # Pixel scrolling plus uniform row heights keep painting
+        # proportional to the viewport instead of the row count
+        self.product_table.setVerticalScrollMode(QTableView.ScrollPerPixel)
+        self.product_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.product_table.selectionModel().selectionChanged.connect(self._schedule_properties)
         
         refresh_button = QPushButton("Refresh")
         refresh_button.clicked.connect(self.load_products)
@@ -109,13 +252,15 @@ class DataViewTab(QWidget):
         property_group = QGroupBox("Properties")
         property_layout = QVBoxLayout()
         
-        self.property_table = QTableWidget()
-        self.property_table.setColumnCount(4)
-        self.property_table.setHorizontalHeaderLabels(["Property", "Value", "Unit", "Language"])
-        self.property_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.property_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.property_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        
+        self.property_model = PropertyTableModel(self)
+        self.property_table = QTableView()
+        self.property_table.setModel(self.property_model)
+        self.property_table.setSelectionBehavior(QTableView.SelectRows)
+        self.property_table.setSelectionMode(QTableView.SingleSelection)
+        self.property_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.property_table.setVerticalScrollMode(QTableView.ScrollPerPixel)
+        self.property_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
         property_button_layout = QHBoxLayout()
         edit_button = QPushButton("Edit Property")
         edit_button.clicked.connect(self.edit_property)
@@ -139,48 +284,76 @@ class DataViewTab(QWidget):
     def showEvent(self, event):
         """Called when tab is shown"""
         super().showEvent(event)
-        self.load_products()
-        self.load_categories()
-        
+        # Post the loads to the event loop so the tab paints first and
+        # the data fills in on the next cycle; repeat shows keep the
+        # already-loaded data and the Refresh button reloads on demand
+        if not self._loaded_once:
+            self._loaded_once = True
+            QTimer.singleShot(0, self.load_products)
+            QTimer.singleShot(0, self.load_categories)
+        
+    def _autosize(self, view, model):
+        """
+        Size columns from the header text plus a 50-row sample.
+
+        resizeColumnsToContents measures every loaded row; sampling
+        keeps the cost flat no matter how much data is in the model.
+        """
+        metrics = view.fontMetrics()
+        sample_rows = min(50, model.rowCount())
+        for column in range(model.columnCount()):
+            width = metrics.horizontalAdvance(str(model.headerData(column, Qt.Horizontal) or ""))
+            for row in range(sample_rows):
+                text = model.data(model.index(row, column), Qt.DisplayRole)
+                if text:
+                    width = max(width, metrics.horizontalAdvance(text))
+            view.setColumnWidth(column, width + 20)
+
     def load_products(self, category=None):
         """Load products from database, optionally filtered by category"""
-        if category:
-            products = self.db_manager.get_products_by_category(category)
-        else:
-            products = self.db_manager.get_all_products()
-        
-        self.product_table.setRowCount(len(products))
-        
-        for row, product in enumerate(products):
-            article_id, name, price, stock, category = product
-            
-            self.product_table.setItem(row, 0, QTableWidgetItem(str(article_id)))
-            self.product_table.setItem(row, 1, QTableWidgetItem(str(name) if name else ""))
-            self.product_table.setItem(row, 2, QTableWidgetItem(str(price) if price else ""))
-            self.product_table.setItem(row, 3, QTableWidgetItem(str(stock) if stock else ""))
-            self.product_table.setItem(row, 4, QTableWidgetItem(str(category) if category else ""))
-            
-        self.product_table.resizeColumnsToContents()
+        # The data underneath may have changed (refresh after an import),
+        # so cached property rows are no longer trustworthy
+        self._prop_cache.clear()
+        self.property_manager.invalidate_properties_cache()
+
+        # The model reset clears the selection, which would emit
+        # selectionChanged and schedule a pointless property load;
+        # block the selection model for the duration of the rebuild
+        blocker = QSignalBlocker(self.product_table.selectionModel())
+
+        # The model pages rows in on demand; the view pulls further
+        # pages via fetchMore as the user scrolls
+        self.product_model.reset(category)
+
+        # Make sure the first page is in before sizing against it
+        if self.product_model.canFetchMore():
+            self.product_model.fetchMore()
+
+        del blocker
+        self._autosize(self.product_table, self.product_model)
         
     def load_categories(self):
         """Load unique categories for filter dropdown"""
         # Clear existing items except "All Categories"
         while self.category_combo.count() > 1:
             self.category_combo.removeItem(1)
-            
-        # Get all products to extract unique categories
-        products = self.db_manager.get_all_products()
-        categories = set()
-        
-        for product in products:
-            category = product[4]  # Category is the 5th column (index 4)
-            if category:
-                categories.add(category)
-                
-        # Add categories to combo box
-        for category in sorted(categories):
+
+        # The database deduplicates and sorts from the category index,
+        # instead of shipping every product row over just to discard
+        # four of its five columns here
+        for category in self.db_manager.get_distinct_categories():
             self.category_combo.addItem(category, category)
             
+    def _schedule_filter(self):
+        """Restart the filter debounce timer on combo changes"""
+        # A dedicated slot because currentIndexChanged passes the index,
+        # which QTimer.start would misread as a new interval
+        self._filter_timer.start()
+
+    def _schedule_properties(self):
+        """Restart the selection debounce timer on selection changes"""
+        self._selection_timer.start()
+
     def filter_products_by_category(self):
         """Filter product list by selected category"""
         category = self.category_combo.currentData()
@@ -197,40 +370,43 @@ class DataViewTab(QWidget):
             return
             
         row = selected_rows[0].row()
-        article_id = self.product_table.item(row, 0).text()
-        
+        article_id = self.product_model.article_id(row)
+
+        # Serve recently built rows from the cache
+        cached = self._prop_cache.get(article_id)
+        if cached is not None:
+            self._prop_cache.move_to_end(article_id)
+            self.property_model.set_properties(cached)
+            self._autosize(self.property_table, self.property_model)
+            return
+
         # Get properties with overrides applied
         properties = self.property_manager.get_properties_for_product(article_id)
-        
+
         # Combine all properties for display
         all_properties = []
         for lang, props in properties.items():
             for prop_name, prop_value in props.items():
-                # Try to extract unit if present
+                # Try to extract unit if present; rpartition returns an
+                # empty separator when there is no space, so no precheck
+                # or intermediate list is needed
                 unit = None
-                if isinstance(prop_value, str) and " " in prop_value:
-                    value_parts = prop_value.rsplit(" ", 1)
-                    if len(value_parts) == 2 and value_parts[1] in ["mm", "cm", "m", "g", "kg", "°C", "V", "A"]:
-                        prop_value = value_parts[0]
-                        unit = value_parts[1]
-                        
+                if isinstance(prop_value, str):
+                    head, sep, tail = prop_value.rpartition(" ")
+                    if sep and tail in _UNITS:
+                        prop_value = head
+                        unit = tail
+
                 all_properties.append((prop_name, prop_value, unit, lang))
                 
-        # Sort properties by name
-        all_properties.sort(key=lambda x: x[0])
-        
-        # Display in table
-        self.property_table.setRowCount(len(all_properties))
-        
-        for row, prop in enumerate(all_properties):
-            property_name, property_value, property_unit, language = prop
-            
-            self.property_table.setItem(row, 0, QTableWidgetItem(str(property_name)))
-            self.property_table.setItem(row, 1, QTableWidgetItem(str(property_value)))
-            self.property_table.setItem(row, 2, QTableWidgetItem(str(property_unit) if property_unit else ""))
-            self.property_table.setItem(row, 3, QTableWidgetItem(str(language)))
-            
-        self.property_table.resizeColumnsToContents()
+        # Remember the built rows, evicting the least recently viewed
+        self._prop_cache[article_id] = all_properties
+        if len(self._prop_cache) > 64:
+            self._prop_cache.popitem(last=False)
+
+        # Display in table; the model sorts by property name itself
+        self.property_model.set_properties(all_properties)
+        self._autosize(self.property_table, self.property_model)
         
     def edit_property(self):
         """Edit the selected property"""
@@ -243,13 +419,10 @@ class DataViewTab(QWidget):
             
         product_row = selected_rows[0].row()
         property_row = property_rows[0].row()
-        
-        article_id = self.product_table.item(product_row, 0).text()
-        prop_name = self.property_table.item(property_row, 0).text()
-        prop_value = self.property_table.item(property_row, 1).text()
-        prop_unit = self.property_table.item(property_row, 2).text()
-        language = self.property_table.item(property_row, 3).text()
-        
+
+        article_id = self.product_model.article_id(product_row)
+        prop_name, prop_value, prop_unit, language = self.property_model.property_at(property_row)
+
         # Open edit dialog
         dialog = PropertyEditDialog(article_id, prop_name, prop_value, prop_unit, language, self)
         
@@ -264,7 +437,11 @@ class DataViewTab(QWidget):
                 values['unit'],
                 values['language']
             )
-            
+
+            # Drop stale caches before reloading
+            self.property_manager.invalidate_properties_cache(article_id)
+            self._prop_cache.pop(article_id, None)
+
             # Refresh properties
             self.load_properties()
             
@@ -279,12 +456,11 @@ class DataViewTab(QWidget):
             
         product_row = selected_rows[0].row()
         property_row = property_rows[0].row()
-        
-        article_id = self.product_table.item(product_row, 0).text()
-        prop_name = self.property_table.item(property_row, 0).text()
-        prop_value = self.property_table.item(property_row, 1).text()
-        language = self.property_table.item(property_row, 3).text()
-        
+
+        article_id = self.product_model.article_id(product_row)
+        prop_name, prop_value, _, language = self.property_model.property_at(property_row)
+        prop_value = str(prop_value) if prop_value is not None else ""
+
         # Create dialog for override value
         dialog = QDialog(self)
         dialog.setWindowTitle(f"Add Override for {prop_name}")
@@ -316,7 +492,11 @@ class DataViewTab(QWidget):
             
             # Store override
             self.db_manager.store_property_override(article_id, prop_name, override_value, language)
-            
+
+            # Drop stale caches before reloading
+            self.property_manager.invalidate_properties_cache(article_id)
+            self._prop_cache.pop(article_id, None)
+
             # Refresh properties
             self.load_properties()
             QMessageBox.information(self, "Override Added", f"Override for {prop_name} has been added.")
@@ -4,6 +4,7 @@ Export Tab Module for exporting product data
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, 
                             QLabel, QTextEdit, QMessageBox, QComboBox, QLineEdit, 
                             QGroupBox, QFormLayout, QCheckBox)
+from PyQt5.QtCore import Qt, QTimer
 from workers.export_worker import ExportWorker
 
 class ExportTab(QWidget):
@@ -60,6 +61,17 @@ class ExportTab(QWidget):
         
         self.status_log = QTextEdit()
         self.status_log.setReadOnly(True)
+        # Bound the log so appends stay O(1) instead of relayouting an
+        # ever-growing document
+        self.status_log.document().setMaximumBlockCount(1000)
+
+        # Incoming messages are buffered and appended in one batch per
+        # timer tick, so a burst of status updates costs one relayout
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
         
         status_layout.addWidget(self.status_log)
         status_group.setLayout(status_layout)
@@ -99,21 +111,28 @@ class ExportTab(QWidget):
             self.apply_overrides_checkbox.isChecked()
         )
         
-        # Connect signals
-        self.export_worker.status_updated.connect(self.log_message)
-        self.export_worker.export_finished.connect(self.export_finished)
+        # Connect signals; queued explicitly since they cross threads
+        self.export_worker.status_updated.connect(self.log_message, Qt.QueuedConnection)
+        self.export_worker.export_finished.connect(self.export_finished, Qt.QueuedConnection)
         
         # Start export
         self.export_worker.start()
         
     def log_message(self, message):
-        """Add message to status log"""
-        self.status_log.append(message)
-        
+        """Queue a message for the status log"""
+        self._log_buf.append(message)
+
+    def _flush_log(self):
+        """Append the buffered messages in a single batch"""
+        if self._log_buf:
+            self.status_log.append("\n".join(self._log_buf))
+            self._log_buf.clear()
+
     def export_finished(self, success, message):
         """Handle export completion"""
         self.export_button.setEnabled(True)
-        
+        self._flush_log()
+
         if success:
             QMessageBox.information(self, "Export Complete", message)
         else:
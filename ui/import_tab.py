@@ -4,6 +4,7 @@ Import Tab Module for CSV file import
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, 
                             QLabel, QProgressBar, QTextEdit, QMessageBox, QComboBox, 
                             QLineEdit, QGroupBox, QFormLayout, QCheckBox)
+from PyQt5.QtCore import QTimer
 from workers.import_worker import ImportWorker
 
 class ImportTab(QWidget):
@@ -57,6 +58,17 @@ class ImportTab(QWidget):
         self.progress_bar = QProgressBar()
         self.status_log = QTextEdit()
         self.status_log.setReadOnly(True)
+        # Bound the log so appends stay O(1) instead of relayouting an
+        # ever-growing document
+        self.status_log.document().setMaximumBlockCount(1000)
+
+        # Incoming messages are buffered and appended in one batch per
+        # timer tick, so a burst of status updates costs one relayout
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
         
         progress_layout.addWidget(self.progress_bar)
         progress_layout.addWidget(self.status_log)
@@ -112,13 +124,20 @@ class ImportTab(QWidget):
         self.progress_bar.setValue(percentage)
         
     def log_message(self, message):
-        """Add message to status log"""
-        self.status_log.append(message)
-        
+        """Queue a message for the status log"""
+        self._log_buf.append(message)
+
+    def _flush_log(self):
+        """Append the buffered messages in a single batch"""
+        if self._log_buf:
+            self.status_log.append("\n".join(self._log_buf))
+            self._log_buf.clear()
+
     def import_finished(self, success, message):
         """Handle import completion"""
         self.import_button.setEnabled(True)
-        
+        self._flush_log()
+
         if success:
             QMessageBox.information(self, "Import Complete", message)
         else:
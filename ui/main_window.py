@@ -4,6 +4,7 @@ Main Window Module for the application
 from PyQt5.QtWidgets import QMainWindow, QTabWidget
 from PyQt5.QtCore import Qt
 from core.database_manager import DatabaseManager
+from core.property_manager import PropertyManager
 from ui.import_tab import ImportTab
 from ui.data_view_tab import DataViewTab
 from ui.export_tab import ExportTab
@@ -14,6 +15,9 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.db_manager = DatabaseManager('product_data.db')
+        # One shared instance so its definition and property caches are
+        # warmed once for the whole application
+        self.property_manager = PropertyManager(self.db_manager)
         self.init_ui()
         
     def init_ui(self):
@@ -26,7 +30,7 @@ class MainWindow(QMainWindow):
         
         # Create tabs
         self.import_tab = ImportTab(self.db_manager)
-        self.data_view_tab = DataViewTab(self.db_manager)
+        self.data_view_tab = DataViewTab(self.db_manager, self.property_manager)
         self.export_tab = ExportTab(self.db_manager)
         
         # Add tabs to widget
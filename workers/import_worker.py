@@ -1,202 +1,362 @@
 """
 Import Worker Module for handling CSV import in a background thread
 """
-import pandas as pd
-import traceback
+import csv
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from PyQt5.QtCore import QThread, pyqtSignal
 from core.html_parser import HTMLParser
 from core.attribute_mapper import AttributeMapper
 
+logger = logging.getLogger(__name__)
+
+# Rows per write batch; one batch is also one write transaction
+_CHUNK_SIZE = 1000
+
+# Below this size the pool start-up costs more than it saves
+_POOL_MIN_ROWS = 200
+
+# Parser instance living inside each pool worker, created on first use
+_worker_parser = None
+
+# Shared across ImportWorker lifetimes: the parser is stateless, and the
+# mapper is reused per database manager so repeated imports keep its
+# loaded mapping table instead of re-reading it from the database
+_HTML_PARSER = HTMLParser()
+_ATTR_MAPPERS = {}
+
+def _mapper_for(db_manager):
+    """Return the cached AttributeMapper for the given database manager"""
+    mapper = _ATTR_MAPPERS.get(id(db_manager))
+    if mapper is None:
+        mapper = AttributeMapper(db_manager)
+        _ATTR_MAPPERS[id(db_manager)] = mapper
+    return mapper
+
+def _pool_parse_html(html_content):
+    """Parse one HTML description inside a pool worker process"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = HTMLParser()
+    return _worker_parser.parse_html_table(html_content)
+
+def _fingerprint(html_content):
+    """64-bit stable fingerprint of a description's HTML"""
+    digest = hashlib.blake2b(html_content.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+def _count_data_rows(csv_file, encoding):
+    """Count the data rows of a CSV without materializing them"""
+    # Count records via the csv reader, not physical lines: quoted
+    # description cells contain embedded newlines, and a line count
+    # would overstate the progress denominator
+    with open(csv_file, encoding=encoding, newline='') as csv_handle:
+        return max(sum(1 for _ in csv.reader(csv_handle, delimiter=';')) - 1, 0)
+
+def _get(row, key):
+    """Return a cell from a DictReader row, mapping empty strings to None"""
+    value = row.get(key)
+    return value if value else None
+
 class ImportWorker(QThread):
     """Worker thread for CSV import and processing"""
     progress_updated = pyqtSignal(int, int)
     status_updated = pyqtSignal(str)
     import_finished = pyqtSignal(bool, str)
-    
+
     def __init__(self, db_manager, csv_file, encoding='iso-8859-1', detect_new_properties=True):
         super().__init__()
         self.db_manager = db_manager
         self.csv_file = csv_file
         self.encoding = encoding
         self.detect_new_properties = detect_new_properties
-        self.html_parser = HTMLParser()
-        self.attribute_mapper = AttributeMapper(db_manager)
-        self.df = None
-        
+        self.html_parser = _HTML_PARSER
+        self.attribute_mapper = _mapper_for(db_manager)
+
     def run(self):
         try:
             self.status_updated.emit("Initializing database...")
             self.db_manager.initialize_database()
-            
+
             self.status_updated.emit(f"Reading CSV file: {self.csv_file}")
             try:
-                self.df = pd.read_csv(self.csv_file, encoding=self.encoding, sep=';', error_bad_lines=False)
-                self.status_updated.emit(f"Successfully read CSV file with {len(self.df)} rows")
+                # Cheap pre-count keeps the progress denominator stable
+                # while the file itself is streamed row by row
+                total_rows = _count_data_rows(self.csv_file, self.encoding)
+                csv_handle = open(self.csv_file, encoding=self.encoding, newline='')
             except Exception as e:
                 self.status_updated.emit(f"Error reading CSV: {str(e)}")
                 self.import_finished.emit(False, f"Failed to read CSV: {str(e)}")
                 return
-            
-            total_rows = len(self.df)
-            self.status_updated.emit(f"Found {total_rows} products to process")
-            
-            # Check if required columns exist
-            if 'p_desc.de' not in self.df.columns and 'p_desc.en' not in self.df.columns:
-                self.import_finished.emit(False, "Error: Neither p_desc.de nor p_desc.en columns found in CSV")
-                return
-                
-            # Get article ID column name, ignoring XTSOL as it's just a placeholder
-            article_id_column = None
-            for col in ['p_model', 'article_id', 'XTINR']:
-                if col in self.df.columns:
-                    article_id_column = col
-                    break
-                    
-            if not article_id_column:
-                self.status_updated.emit("Warning: Could not identify standard article ID column. Attempting to use first non-XTSOL column.")
-                # Try to use the first column that is not XTSOL as article ID
-                for col in self.df.columns:
-                    if col != 'XTSOL':
+
+            with csv_handle:
+                # The import is plain row-by-row string work, so the csv
+                # module does everything a DataFrame did without the
+                # dtype-inference and per-row Series overhead
+                reader = csv.DictReader(csv_handle, delimiter=';')
+                fieldnames = reader.fieldnames or []
+
+                if total_rows == 0 or not fieldnames:
+                    self.import_finished.emit(False, "Error: CSV file contains no data rows")
+                    return
+
+                self.status_updated.emit(f"Found {total_rows} products to process")
+
+                # Check if required columns exist
+                if 'p_desc.de' not in fieldnames and 'p_desc.en' not in fieldnames:
+                    self.import_finished.emit(False, "Error: Neither p_desc.de nor p_desc.en columns found in CSV")
+                    return
+
+                # Get article ID column name, ignoring XTSOL as it's just a placeholder
+                article_id_column = None
+                for col in ['p_model', 'article_id', 'XTINR']:
+                    if col in fieldnames:
                         article_id_column = col
-                        self.status_updated.emit(f"Using '{col}' as article ID column")
                         break
-            
-            if not article_id_column:
-                self.import_finished.emit(False, "Error: Could not identify any usable article ID column")
-                return
-            
-            # Detect and register new properties if enabled
-            if self.detect_new_properties:
-                try:
-                    self._detect_and_register_new_properties()
-                except Exception as e:
-                    self.status_updated.emit(f"Warning: Error detecting new properties: {str(e)}")
-                    # Continue with import even if property detection fails
-            
-            # Process each row
-            for index, row in self.df.iterrows():
+
+                if not article_id_column:
+                    self.status_updated.emit("Warning: Could not identify standard article ID column. Attempting to use first non-XTSOL column.")
+                    # Try to use the first column that is not XTSOL as article ID
+                    for col in fieldnames:
+                        if col != 'XTSOL':
+                            article_id_column = col
+                            self.status_updated.emit(f"Using '{col}' as article ID column")
+                            break
+
+                if not article_id_column:
+                    self.import_finished.emit(False, "Error: Could not identify any usable article ID column")
+                    return
+
+                # Detect and register new properties if enabled
+                if self.detect_new_properties:
+                    try:
+                        self._detect_and_register_new_properties(total_rows)
+                    except Exception as e:
+                        self.status_updated.emit(f"Warning: Error detecting new properties: {str(e)}")
+                        # Continue with import even if property detection fails
+
+                # Fingerprints from earlier imports let unchanged descriptions
+                # skip the whole parse-and-store pipeline
+                fingerprints = self.db_manager.load_html_fingerprints()
+                new_fingerprints = []
+
+                # Which description columns the file actually has is
+                # loop-invariant, so the check leaves the row loop
+                desc_columns = tuple(
+                    (column, language)
+                    for column, language in (('p_desc.de', 'de'), ('p_desc.en', 'en'))
+                    if column in fieldnames
+                )
+
+                # Rows are accumulated and flushed in batches: one
+                # transaction and one prepared statement per table
+                product_rows = []
+                property_rows = []
+                parse_jobs = []
+                parsed_memo = {}
+                processed = 0
+
+                # Parsing is pure CPU work per description with no shared
+                # state, so a process pool spreads it over all cores while
+                # this thread keeps reading rows and writing to SQLite
+                executor = ProcessPoolExecutor() if total_rows >= _POOL_MIN_ROWS else None
                 try:
-                    # Update progress
-                    self.progress_updated.emit(index + 1, total_rows)
-                    
-                    if article_id_column not in row or pd.isna(row[article_id_column]):
-                        self.status_updated.emit(f"Skipping row {index+1}: Missing article ID")
-                        continue
-                    
-                    article_id = row[article_id_column]
-                    self.status_updated.emit(f"Processing article {article_id}")
-                    
-                    # Store basic product info
-                    name = row.get('p_name', None)
-                    price = row.get('p_price', row.get('p_priceNoTax', None))
-                    stock = row.get('p_stock', None)
-                    category = row.get('p_category', row.get('category', None))
-                    
-                    # Store product in database
-                    self.db_manager.store_product(article_id, name, price, stock, category)
-                    
-                    # Process German description if available
-                    if 'p_desc.de' in self.df.columns and pd.notna(row['p_desc.de']):
+                    for row in reader:
+                        processed += 1
                         try:
-                            html_content = str(row['p_desc.de'])
-                            properties = self.html_parser.parse_html_table(html_content)
-                            
-                            for prop_name, prop_value in properties.items():
-                                # Apply attribute mapping
-                                mapped_name = self.attribute_mapper.get_standard_name(prop_name, 'de')
-                                
-                                # Normalize property
-                                std_name, std_value, unit = self.html_parser.normalize_property(mapped_name, prop_value, 'de')
-                                
-                                # Store property
-                                self.db_manager.store_property(article_id, std_name, std_value, unit, 'de')
-                        except Exception as e:
-                            self.status_updated.emit(f"Error processing German description for {article_id}: {str(e)}")
-                    
-                    # Process English description if available
-                    if 'p_desc.en' in self.df.columns and pd.notna(row['p_desc.en']):
-                        try:
-                            html_content = str(row['p_desc.en'])
-                            properties = self.html_parser.parse_html_table(html_content)
-                            
-                            for prop_name, prop_value in properties.items():
-                                # Apply attribute mapping
-                                mapped_name = self.attribute_mapper.get_standard_name(prop_name, 'en')
-                                
-                                # Normalize property
-                                std_name, std_value, unit = self.html_parser.normalize_property(mapped_name, prop_value, 'en')
-                                
-                                # Store property
-                                self.db_manager.store_property(article_id, std_name, std_value, unit, 'en')
+                            article_id = _get(row, article_id_column)
+                            if article_id is None:
+                                self.status_updated.emit(f"Skipping row {processed}: Missing article ID")
+                                continue
+
+                            # Store basic product info
+                            name = _get(row, 'p_name')
+                            price = _get(row, 'p_price')
+                            if price is None:
+                                price = _get(row, 'p_priceNoTax')
+                            stock = _get(row, 'p_stock')
+                            category = _get(row, 'p_category')
+                            if category is None:
+                                category = _get(row, 'category')
+
+                            # Queue product for the next batch flush
+                            product_rows.append((article_id, name, price, stock, category))
+
+                            # Queue descriptions for parsing; unchanged HTML
+                            # skips the parse-and-store path entirely
+                            for column, language in desc_columns:
+                                if _get(row, column):
+                                    html_content = row[column]
+                                    fingerprint = _fingerprint(html_content)
+                                    if fingerprints.get((article_id, language)) != fingerprint:
+                                        parse_jobs.append((article_id, language, html_content, fingerprint))
+
+                            # One flush and one progress update per batch
+                            if processed % _CHUNK_SIZE == 0:
+                                self._drain_parse_jobs(executor, parse_jobs, parsed_memo,
+                                                       property_rows, new_fingerprints)
+                                if product_rows:
+                                    self.db_manager.store_products_bulk(product_rows)
+                                    product_rows.clear()
+                                if property_rows:
+                                    self.db_manager.store_properties_bulk(property_rows)
+                                    property_rows.clear()
+                                # One status line and one progress tick per
+                                # batch; a per-row emit would queue an event
+                                # into the GUI thread for every single row
+                                self.status_updated.emit(f"Processed {processed} of {total_rows} rows")
+                                self.progress_updated.emit(min(processed, total_rows), total_rows)
+
                         except Exception as e:
-                            self.status_updated.emit(f"Error processing English description for {article_id}: {str(e)}")
-                
-                except Exception as e:
-                    self.status_updated.emit(f"Error processing row {index+1}: {str(e)}")
-                    # Continue with next row instead of aborting the entire import
-            
+                            self.status_updated.emit(f"Error processing row {processed}: {str(e)}")
+                            # Continue with next row instead of aborting the entire import
+
+                    # Final flush of whatever is left in the batches
+                    self._drain_parse_jobs(executor, parse_jobs, parsed_memo,
+                                           property_rows, new_fingerprints)
+                    if product_rows:
+                        self.db_manager.store_products_bulk(product_rows)
+                    if property_rows:
+                        self.db_manager.store_properties_bulk(property_rows)
+                    self.progress_updated.emit(min(processed, total_rows), total_rows)
+                finally:
+                    if executor is not None:
+                        executor.shutdown()
+
+                # Persist the fingerprints of everything parsed this run
+                if new_fingerprints:
+                    self.db_manager.store_html_fingerprints_bulk(new_fingerprints)
+
             self.status_updated.emit("Import completed successfully!")
-            self.import_finished.emit(True, f"Successfully imported {total_rows} products")
-            
+            self.import_finished.emit(True, f"Successfully imported {processed} products")
+
+        except Exception as e:
+            # Full traceback goes to the log; the status line only needs
+            # the message itself
+            logger.exception("Import failed")
+            self.status_updated.emit(f"Error during import: {e!s}")
+            self.import_finished.emit(False, f"Import failed: {e!s}")
+
+    def _drain_parse_jobs(self, executor, parse_jobs, parsed_memo, property_rows, new_fingerprints):
+        """
+        Parse the queued descriptions and turn them into property rows.
+
+        Duplicate HTML blobs (color variants of the same product family
+        share identical tables) are parsed once via the memo; the rest
+        go through the process pool when one is available.
+        """
+        if not parse_jobs:
+            return
+
+        # Collect the blobs this batch actually needs parsed
+        unseen = []
+        queued = set()
+        for _, _, html_content, _ in parse_jobs:
+            if html_content not in parsed_memo and html_content not in queued:
+                queued.add(html_content)
+                unseen.append(html_content)
+
+        try:
+            if executor is not None:
+                parsed_memo.update(zip(unseen, executor.map(_pool_parse_html, unseen, chunksize=64)))
+            else:
+                for html_content in unseen:
+                    parsed_memo[html_content] = self.html_parser.parse_html_table(html_content)
         except Exception as e:
-            error_details = traceback.format_exc()
-            self.status_updated.emit(f"Error during import: {str(e)}")
-            self.status_updated.emit(f"Error details: {error_details}")
-            self.import_finished.emit(False, f"Import failed: {str(e)}")
-    
-    def _detect_and_register_new_properties(self):
+            self.status_updated.emit(f"Error parsing descriptions: {str(e)}")
+            # Retry the remainder inline so one bad blob does not sink the
+            # batch. Failures stay out of the memo: the fingerprint is only
+            # stored after a successful parse, so the description is picked
+            # up again on the next import instead of being skipped forever
+            for html_content in unseen:
+                if html_content not in parsed_memo:
+                    try:
+                        parsed_memo[html_content] = self.html_parser.parse_html_table(html_content)
+                    except Exception:
+                        logger.exception("Failed to parse description")
+
+        # Mapping and normalization stay in this thread; both are cached
+        # dict lookups and cheap compared to the parse itself. The bound
+        # methods are hoisted to locals so the inner loop, which runs per
+        # property of every changed row, skips the repeated attribute
+        # lookups
+        get_standard_name = self.attribute_mapper.get_standard_name
+        normalize_property = self.html_parser.normalize_property
+        add_property = property_rows.append
+        add_fingerprint = new_fingerprints.append
+        get_parsed = parsed_memo.get
+
+        for article_id, language, html_content, fingerprint in parse_jobs:
+            properties = get_parsed(html_content)
+            if properties is None:
+                # Parse failed; leave the row unfingerprinted so a later
+                # import retries it
+                continue
+
+            for prop_name, prop_value in properties.items():
+                # Map, normalize, and queue for the next batch flush
+                std_name, std_value, unit = normalize_property(
+                    get_standard_name(prop_name, language), prop_value, language
+                )
+                add_property((article_id, std_name, std_value, unit, language))
+
+            add_fingerprint((article_id, language, fingerprint))
+
+        parse_jobs.clear()
+
+    def _detect_and_register_new_properties(self, total_rows):
         """
         Detect new properties in the CSV file and register them in the database.
         """
         self.status_updated.emit("Detecting new properties...")
-        
-        # Load known properties
-        known_properties = []
-        for name_de, name_en, _, _ in self.db_manager.get_property_definitions():
-            if name_de:
-                known_properties.append(name_de)
-            if name_en:
-                known_properties.append(name_en)
-        
+
+        # Load known properties; a frozenset keeps the membership test in
+        # detect_new_properties O(1) however many definitions exist
+        known_properties = frozenset(
+            name
+            for name_de, name_en, _, _ in self.db_manager.get_property_definitions()
+            for name in (name_de, name_en)
+            if name
+        )
+
         # Scan HTML contents for new properties
         new_properties = set()
-        total_rows = len(self.df)
-        
-        # Process a sample of rows to improve performance
+
+        # Process a sample of rows to improve performance; the stride
+        # spreads the sample across the streamed file
         sample_size = min(100, total_rows)
-        sample_indices = list(range(0, total_rows, max(1, total_rows // sample_size)))
-        
-        for i, index in enumerate(sample_indices):
-            row = self.df.iloc[index]
-            self.progress_updated.emit(i + 1, len(sample_indices))
-                
-            # Process German description
-            if 'p_desc.de' in self.df.columns and pd.notna(row['p_desc.de']):
-                try:
-                    html_content = str(row['p_desc.de'])
-                    properties = self.html_parser.parse_html_table(html_content)
-                    new_props_de = self.html_parser.detect_new_properties(properties, known_properties)
-                    new_properties.update([(prop, 'de') for prop in new_props_de])
-                except Exception as e:
-                    self.status_updated.emit(f"Error detecting properties in German description: {str(e)}")
-                
-            # Process English description
-            if 'p_desc.en' in self.df.columns and pd.notna(row['p_desc.en']):
-                try:
-                    html_content = str(row['p_desc.en'])
-                    properties = self.html_parser.parse_html_table(html_content)
-                    new_props_en = self.html_parser.detect_new_properties(properties, known_properties)
-                    new_properties.update([(prop, 'en') for prop in new_props_en])
-                except Exception as e:
-                    self.status_updated.emit(f"Error detecting properties in English description: {str(e)}")
-        
-        # Register new properties in the database
-        for prop_name, lang in new_properties:
+        stride = max(1, total_rows // sample_size) if sample_size else 1
+
+        with open(self.csv_file, encoding=self.encoding, newline='') as csv_handle:
+            reader = csv.DictReader(csv_handle, delimiter=';')
+
+            sampled = 0
+            for row_number, row in enumerate(reader):
+                if row_number % stride != 0:
+                    continue
+                sampled += 1
+                self.progress_updated.emit(sampled, max(1, total_rows // stride))
+
+                for column, language in (('p_desc.de', 'de'), ('p_desc.en', 'en')):
+                    html_content = _get(row, column)
+                    if html_content is None:
+                        continue
+                    try:
+                        properties = self.html_parser.parse_html_table(html_content)
+                        new_props = self.html_parser.detect_new_properties(properties, known_properties)
+                        new_properties.update([(prop, language) for prop in new_props])
+                    except Exception as e:
+                        self.status_updated.emit(f"Error detecting properties in description: {str(e)}")
+
+        # Register new properties in the database in one batch
+        registered = 0
+        if new_properties:
             try:
-                added = self.db_manager.add_new_property_if_not_exists(prop_name, lang)
-                if added:
-                    self.status_updated.emit(f"New property detected: {prop_name} ({lang})")
+                registered = self.db_manager.add_new_properties_bulk(new_properties)
             except Exception as e:
-                self.status_updated.emit(f"Error registering property {prop_name}: {str(e)}")
-        
-        self.status_updated.emit(f"Total {len(new_properties)} new properties detected.")
\ No newline at end of file
+                self.status_updated.emit(f"Error registering new properties: {str(e)}")
+
+        self.status_updated.emit(
+            f"Total {len(new_properties)} new properties detected, {registered} newly registered."
+        )